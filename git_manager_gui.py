@@ -1,11 +1,23 @@
 import os
 import sys
+import json
+import stat
+import struct
+import re
+import heapq
+import asyncio
 import shlex
+import time
+import atexit
+import weakref
 import queue
 import shutil
+import functools
+import itertools
+import collections
 import threading
+import concurrent.futures
 import subprocess
-import platform
 import datetime as dt
 import tkinter as tk
 import ttkbootstrap as ttk
@@ -13,93 +25,869 @@ from ttkbootstrap import Style
 from ttkbootstrap.constants import *
 from tkinter import filedialog, messagebox
 
+try:
+    import pygit2  # optional: in-process libgit2 reads for branches/log
+except ImportError:
+    pygit2 = None
+
+try:
+    # optional: refresh when the working tree changes outside the app
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+
 # ---------------------------
 # Utilities
 # ---------------------------
 
-def is_windows():
-    return platform.system().lower().startswith("win")
+# Resolved once at import; these are checked on every spawn and UI action.
+IS_WINDOWS = sys.platform.startswith("win")
+IS_MACOS = sys.platform == "darwin"
 
-def safe_run(args, cwd=None):
+def _popen_kwargs():
+    """
+    Extra Popen arguments shared by every git invocation. Git never waits on a
+    credential prompt; on Windows no console window is allocated, elsewhere
+    inherited fds are closed explicitly.
+    """
+    env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+    if IS_WINDOWS:
+        si = subprocess.STARTUPINFO()
+        si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        si.wShowWindow = subprocess.SW_HIDE
+        return {
+            "env": env,
+            "creationflags": subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP,
+            "startupinfo": si,
+        }
+    return {"env": env, "close_fds": True}
+
+POPEN_KWARGS = _popen_kwargs()
+
+# Resolved once so each spawn doesn't search PATH for git again
+GIT_EXE = shutil.which("git") or "git"
+
+def _argv(args):
+    return [GIT_EXE] + args[1:] if args and args[0] == "git" else args
+
+# Global options for read-only queries: no optional index lock, parallel
+# index preload, Windows fs cache, and never trigger auto-gc from a refresh.
+GIT_RO_PREFIX = ["git", "--no-optional-locks", "-c", "core.preloadIndex=true", "-c", "core.fscache=true", "-c", "gc.auto=0"]
+
+# Read-only commands also run in the C locale: their output is parsed, not
+# shown, and git skips locale/translation lookups. GIT_OPTIONAL_LOCKS=0 is the
+# env form of the --no-optional-locks prefix, so a refresh never writes the
+# index. Mutating commands keep normal locking and may refresh the index's
+# stat data, which makes the next status cheaper.
+RO_POPEN_KWARGS = dict(POPEN_KWARGS, env=dict(POPEN_KWARGS["env"], LC_ALL="C", GIT_OPTIONAL_LOCKS="0"))
+
+def _git_ro(args):
+    """Build a read-only git command line; mutations keep plain ["git", ...]."""
+    return GIT_RO_PREFIX + args
+
+def _popen_kwargs_for(args):
+    return RO_POPEN_KWARGS if args[:2] == GIT_RO_PREFIX[:2] else POPEN_KWARGS
+
+def safe_run(args, cwd=None, text=True):
     """
     Run a git command and return (stdout, stderr, returncode).
     Args must be a list. No shell=True for safety.
+    With text=False stdout/stderr are returned as raw bytes (for -z output);
+    otherwise they are decoded as UTF-8 like async_run, not in the locale's
+    encoding.
     """
     try:
         proc = subprocess.run(
-            args,
+            _argv(args),
             cwd=cwd,
             capture_output=True,
-            text=True
+            **_popen_kwargs_for(args)
         )
-        return proc.stdout, proc.stderr, proc.returncode
+        if not text:
+            return proc.stdout, proc.stderr, proc.returncode
+        return proc.stdout.decode("utf-8", "replace"), proc.stderr.decode("utf-8", "replace"), proc.returncode
     except Exception as e:
-        return "", str(e), 1
+        if text:
+            return "", str(e), 1
+        return b"", str(e).encode("utf-8"), 1
 
-def parse_status_porcelain(text):
+def read_log(n, cwd=None):
     """
-    Parse 'git status --porcelain' output to list of dicts:
-    [{'path': 'file', 'status': 'Modified', 'index': 'M', 'worktree': ' '}, ...]
+    Stream `git log` and return ([(sha, short_sha, subject), ...], stderr, returncode).
+    Records are NUL-separated and parsed as they arrive; once `n` are read the
+    process is terminated instead of buffering its whole output.
     """
-    items = []
-    for line in text.splitlines():
-        if not line.strip():
-            continue
-        x = line[:2]
-        rest = line[3:]
-        index_flag = x[0]
-        wt_flag = x[1]
-        if line.startswith("??"):
-            items.append({"path": line[3:].strip(), "status": "Untracked", "index": "?", "worktree": "?"})
-            continue
+    rows = []
+    try:
+        proc = subprocess.Popen(
+            _argv(_git_ro(["log", f"-n{n}", "--pretty=format:%H%x09%h%x09%s", "-z"])),
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            **RO_POPEN_KWARGS
+        )
+    except Exception as e:
+        return rows, str(e), 1
+    pending = b""
+    while len(rows) < n:
+        chunk = proc.stdout.read1(65536)
+        if not chunk:
+            break
+        complete, sep, pending = (pending + chunk).rpartition(b"\0")
+        if sep:
+            # Decode each block of whole records once, then split into rows
+            records = complete.decode("utf-8", "replace").split("\0")
+            rows.extend(tuple(rec.split("\t", 2)) for rec in records[:n - len(rows)])
+    if pending and len(rows) < n:
+        rows.append(tuple(pending.decode("utf-8", "replace").split("\t", 2)))
+    if proc.poll() is None:
+        proc.terminate()
+    _, err = proc.communicate()
+    rc = proc.returncode if len(rows) < n else 0
+    return rows, err.decode("utf-8", "replace"), rc
+
+def log_rows(session, n, cwd=None):
+    """
+    Return ([(sha, short_sha, subject), ...], stderr, returncode) for the last `n`
+    commits: in-process via pygit2 when installed, else through the GitSession,
+    else with a one-off read_log.
+    """
+    rows = pygit2_log(cwd or session.repo, n)
+    if rows is None:
+        rows = session.log(n)
+    if rows is None:
+        return read_log(n, cwd=cwd)
+    return rows, "", 0
+
+
+def pathspec_bytes(paths):
+    """NUL-terminated pathspecs for git's --pathspec-from-file=- --pathspec-file-nul."""
+    return b"".join(os.fsencode(p) + b"\0" for p in paths)
+
+
+# Arguments that never need shell quoting for display
+_SAFE_ARG_RE = re.compile(r"^[A-Za-z0-9_./=:-]+$")
+CMD_DISPLAY_MAX_ARGS = 16
+
+def _posix_quote(arg):
+    return arg if _SAFE_ARG_RE.match(arg) else shlex.quote(arg)
+
+def format_cmd(args):
+    """
+    Console rendering of a command line. Long path lists (stage/unstage/discard of
+    many files) are summarised as "git add [<N> paths]".
+    """
+    if len(args) > CMD_DISPLAY_MAX_ARGS:
+        if "--" in args:
+            head = args.index("--") + 1
+        else:
+            head = next((i for i, a in enumerate(args) if i >= 2 and not a.startswith("-")), len(args))
+        if len(args) - head > 1:
+            return f"{format_cmd(args[:head])} [<{len(args) - head}> paths]"
+    if IS_WINDOWS:
+        return subprocess.list2cmdline(args)
+    return " ".join(_posix_quote(a) for a in args)
+
+async def async_run(args, cwd=None, text=True, stdin=None):
+    """
+    asyncio counterpart of safe_run: returns (stdout, stderr, returncode)
+    without blocking the event loop while git runs. `stdin` (bytes) is fed
+    to the process when given.
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *_argv(args),
+            cwd=cwd,
+            stdin=asyncio.subprocess.PIPE if stdin is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            **_popen_kwargs_for(args)
+        )
+        out, err = await proc.communicate(stdin)
+        if not text:
+            return out, err, proc.returncode
+        return out.decode("utf-8", "replace"), err.decode("utf-8", "replace"), proc.returncode
+    except Exception as e:
+        if text:
+            return "", str(e), 1
+        return b"", str(e).encode("utf-8"), 1
+
+@functools.lru_cache(maxsize=128)
+def _safe_run_cached(args, cwd=None):
+    """
+    Memoized safe_run for idempotent read-only commands (global config reads,
+    `git --version`, ...). `args` must be a tuple so it can be hashed.
+    """
+    return safe_run(list(args), cwd=cwd)
+
+def invalidate_cache():
+    """Drop memoized command results, e.g. after the global config was changed."""
+    _safe_run_cached.cache_clear()
+    try:
+        os.remove(STATE_FILE)
+    except OSError:
+        pass
+
+# ---------------------------
+# Startup state cache
+# ---------------------------
+
+STATE_FILE = os.path.join(os.path.expanduser("~"), ".config", "git-manager-pro", "state.json")
+
+def _global_config_key():
+    """mtimes of the files `git config --global` reads; any edit changes the key."""
+    xdg = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    paths = [os.environ.get("GIT_CONFIG_GLOBAL") or os.path.join(os.path.expanduser("~"), ".gitconfig"),
+             os.path.join(xdg, "git", "config")]
+    key = []
+    for path in paths:
+        try:
+            key.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            key.append(0)
+    return key
+
+def load_cached_identity():
+    """(name, email) saved by save_cached_identity if the global config is unchanged, else None."""
+    try:
+        with open(STATE_FILE, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("key") == _global_config_key():
+            return state["name"], state["email"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return None
+
+def save_cached_identity(name, email):
+    try:
+        os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+        with open(STATE_FILE, "w", encoding="utf-8") as f:
+            json.dump({"key": _global_config_key(), "name": name, "email": email}, f)
+    except OSError:
+        pass
+
+# Max characters written to the console per idle callback
+LOG_FLUSH_CHARS = 4096
+HUGE_REPO_THRESHOLD = 100_000  # index entries above which untracked files aren't scanned
+CONSOLE_MAX_LINES = 5000  # older console lines are trimmed from the top
+LOG_CHUNK_ROWS = 200  # commits inserted into the Log tab per idle slot
+VALIDATED_REPO_TTL = 5.0  # seconds a previous repo isdir check is trusted
+REFRESH_DEBOUNCE_MS = 120  # refresh delay after a lone request
+REFRESH_DEBOUNCE_MAX_MS = 1000  # ...stretched toward this during bursts
+REFRESH_MAX_WAIT_MS = 2000  # a burst never holds a refresh back longer than this
+WATCH_DEBOUNCE_MS = 300  # quiet time after the last file event before refreshing
+
+# PATH lookups for terminal emulators don't change while the app is running
+_which = functools.lru_cache(maxsize=None)(shutil.which)
+
+# Live GitSessions, closed at interpreter exit so no cat-file helper outlives the app
+_SESSIONS = weakref.WeakSet()
+
+@atexit.register
+def _close_sessions():
+    for session in list(_SESSIONS):
+        session.close()
+
+class GitSession:
+    """
+    Long-running `git cat-file --batch` process for one repository.
+    Each lookup writes "<rev>\\n" to stdin and reads back the framed
+    "<sha> <type> <size>\\n<bytes>\\n" reply, so repeated object reads
+    don't pay a fork/exec per call; a sibling `--batch-check` answers SHA and
+    existence queries. Mutating commands still go through safe_run.
+    """
+
+    # Commit objects kept per session; full SHAs name immutable content
+    COMMIT_CACHE_SIZE = 4096
+
+    def __init__(self, repo):
+        self.repo = repo
+        self._proc = None
+        self._check_proc = None
+        self._lock = threading.Lock()
+        self._commits = {}
+        _SESSIONS.add(self)
+
+    def _spawn(self, args):
+        return subprocess.Popen(
+            _argv(_git_ro(args)),
+            cwd=self.repo,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            **RO_POPEN_KWARGS
+        )
 
-        # Handle rename format: 'R  src -> dst'
-        if "->" in rest:
+    def _ensure_proc(self):
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = self._spawn(["cat-file", "--batch"])
+        return self._proc
+
+    def _ensure_check_proc(self):
+        if self._check_proc is None or self._check_proc.poll() is not None:
+            self._check_proc = self._spawn(["cat-file", "--batch-check=%(objectname) %(objecttype)"])
+        return self._check_proc
+
+    def resolve(self, rev, obj_type=None):
+        """
+        Return the full SHA `rev` names (optionally requiring `obj_type`), or None.
+        Answered by a second persistent `cat-file --batch-check`, so no body is read.
+        """
+        if not rev or any(ch in rev for ch in "\r\n"):
+            return None
+        with self._lock:
+            try:
+                proc = self._ensure_check_proc()
+                proc.stdin.write(rev.encode("utf-8") + b"\n")
+                proc.stdin.flush()
+                parts = proc.stdout.readline().split()
+            except (OSError, ValueError):
+                self._close_locked()
+                return None
+        # "<rev> missing" / "<rev> ambiguous" have the same shape as a hit
+        if len(parts) != 2 or parts[1] in (b"missing", b"ambiguous"):
+            return None
+        sha, found = parts[0].decode("ascii"), parts[1].decode("ascii")
+        if obj_type and found != obj_type:
+            return None
+        return sha
+
+    def _read_commit(self, sha):
+        """read_object for a full commit SHA, memoized for the life of the session."""
+        obj = self._commits.get(sha)
+        if obj is None:
+            obj = self.read_object(sha)
+            if obj is not None:
+                if len(self._commits) >= self.COMMIT_CACHE_SIZE:
+                    self._commits.clear()
+                self._commits[sha] = obj
+        return obj
+
+    def read_object(self, rev):
+        """Return (sha, type, body_bytes) for `rev`, or None if it doesn't resolve."""
+        if not rev or any(ch in rev for ch in "\r\n"):
+            return None
+        with self._lock:
+            try:
+                proc = self._ensure_proc()
+                proc.stdin.write(rev.encode("utf-8") + b"\n")
+                proc.stdin.flush()
+                header = proc.stdout.readline()
+                if not header:
+                    self._close_locked()
+                    return None
+                parts = header.split()
+                # "<rev> missing" / "<rev> ambiguous" carry no body
+                if len(parts) != 3:
+                    return None
+                sha, obj_type, size = parts
+                body = proc.stdout.read(int(size) + 1)[:-1]
+                return sha.decode("ascii"), obj_type.decode("ascii"), body
+            except (OSError, ValueError):
+                self._close_locked()
+                return None
+
+    def log(self, n, rev="HEAD"):
+        """
+        Walk up to `n` commits from `rev`, newest committer date first (git log's
+        default order), returning [(sha, short_sha, subject), ...].
+        Returns None if the helper process is unusable so callers can fall back.
+        """
+        head = self.read_object(rev)
+        if head is None:
+            return None if self._proc is None else []
+        if head[1] != "commit":
+            return []
+        rows = []
+        seen = {head[0]}
+        order = 0
+        heap = [(-_commit_time(head[2]), order, head[0], head[2])]
+        while heap and len(rows) < n:
+            _, _, sha, body = heapq.heappop(heap)
+            rows.append((sha, sha[:7], _commit_subject(body)))
+            for parent in _commit_parents(body):
+                if parent in seen:
+                    continue
+                seen.add(parent)
+                obj = self._read_commit(parent)
+                if obj is None or obj[1] != "commit":
+                    continue
+                order += 1
+                heapq.heappush(heap, (-_commit_time(obj[2]), order, obj[0], obj[2]))
+        return rows
+
+    def _close_locked(self):
+        procs = (self._proc, self._check_proc)
+        self._proc = self._check_proc = None
+        for proc in procs:
+            if proc is None:
+                continue
             try:
-                _, dst = rest.split("->", 1)
-                path = dst.strip()
-                status = "Renamed"
+                proc.stdin.close()
+                proc.wait(timeout=2)
             except Exception:
-                path = rest.strip()
-                status = "Renamed"
+                proc.kill()
+
+    def close(self):
+        with self._lock:
+            self._close_locked()
+
+def _commit_parents(body):
+    parents = []
+    for line in body.split(b"\n"):
+        if not line:
+            break
+        if line.startswith(b"parent "):
+            parents.append(line[7:].decode("ascii"))
+    return parents
+
+def _commit_time(body):
+    for line in body.split(b"\n"):
+        if not line:
+            break
+        if line.startswith(b"committer "):
+            try:
+                return int(line.rsplit(b" ", 2)[1])
+            except (IndexError, ValueError):
+                return 0
+    return 0
+
+def _commit_subject(body):
+    _, _, message = body.partition(b"\n\n")
+    return _message_subject(message)
+
+def _message_subject(message):
+    # Same as %s: first paragraph of the message, lines joined by spaces
+    paragraph = message.lstrip(b"\n").split(b"\n\n", 1)[0]
+    return " ".join(paragraph.decode("utf-8", "replace").split("\n")).strip()
+
+# ---------------------------
+# Optional libgit2 reads
+# ---------------------------
+
+def _pygit2_repo(path):
+    if pygit2 is None:
+        return None
+    try:
+        return pygit2.Repository(path)
+    except Exception:
+        return None
+
+def pygit2_branches(path):
+    """[[branch, sha], ...] for local branches via libgit2, or None to fall back to git."""
+    repo = _pygit2_repo(path)
+    if repo is None:
+        return None
+    try:
+        local = repo.branches.local
+        return [[name, str(local[name].target)] for name in sorted(local)]
+    except Exception:
+        return None
+
+def read_global_config(key):
+    """Value of a --global config key ("" if unset), via libgit2 when available, else `git config`."""
+    if pygit2 is not None:
+        try:
+            return pygit2.Config.get_global_config()[key].strip()
+        except KeyError:
+            return ""
+        except Exception:
+            pass  # no global config file yet, or libgit2 error: ask git
+    out, _, rc = _safe_run_cached(tuple(_git_ro(["config", "--global", key])))
+    return out.strip() if rc == 0 else ""
+
+def pygit2_log(path, n):
+    """[(sha, short_sha, subject), ...] for the last `n` commits via libgit2, or None."""
+    repo = _pygit2_repo(path)
+    try:
+        if repo is None or repo.head_is_unborn:
+            return None
+        walker = repo.walk(repo.head.target, pygit2.GIT_SORT_TIME)
+        return [(str(c.id), c.short_id, _message_subject(c.raw_message))
+                for c in itertools.islice(walker, n)]
+    except Exception:
+        return None
+
+def _pygit2_status_label(flags):
+    # Same labels status_rows gives: index change wins, conflicts are "Unmerged"
+    if flags & pygit2.GIT_STATUS_CONFLICTED:
+        return "Unmerged"
+    for bit, label in (
+        (pygit2.GIT_STATUS_INDEX_NEW, "Added"),
+        (pygit2.GIT_STATUS_INDEX_MODIFIED, "Modified"),
+        (pygit2.GIT_STATUS_INDEX_DELETED, "Deleted"),
+        (pygit2.GIT_STATUS_INDEX_RENAMED, "Renamed"),
+        (pygit2.GIT_STATUS_INDEX_TYPECHANGE, "T"),
+        (pygit2.GIT_STATUS_WT_NEW, "Untracked"),
+        (pygit2.GIT_STATUS_WT_MODIFIED, "Modified"),
+        (pygit2.GIT_STATUS_WT_DELETED, "Deleted"),
+        (pygit2.GIT_STATUS_WT_RENAMED, "Renamed"),
+        (pygit2.GIT_STATUS_WT_TYPECHANGE, "T"),
+    ):
+        if flags & bit:
+            return label
+    return "Changed"
+
+def pygit2_status(path, untracked=True):
+    """
+    ((branch, ahead, behind), [(status, path), ...]) via libgit2, shaped like
+    parse_branch_header + status_rows, or None to fall back to `git status`.
+    Repos with submodules are left to git so --ignore-submodules applies.
+    Staged renames show as an add and a delete (libgit2 skips rename detection).
+    """
+    repo = _pygit2_repo(path)
+    if repo is None or repo.is_bare or os.path.exists(os.path.join(path, ".gitmodules")):
+        return None
+    try:
+        if repo.head_is_detached:
+            state = ("HEAD (no branch)", 0, 0)
         else:
-            path = rest.strip()
-            mapping = {
-                "M": "Modified",
-                "A": "Added",
-                "D": "Deleted",
-                "R": "Renamed",
-                "C": "Copied",
-                "U": "Unmerged",
-                " ": " "
-            }
-            status = "Changed"
-            if index_flag != " ":
-                status = mapping.get(index_flag, index_flag)
-            elif wt_flag != " ":
-                status = mapping.get(wt_flag, wt_flag)
-
-        items.append({"path": path, "status": status, "index": index_flag, "worktree": wt_flag})
-    return items
-
-def parse_ahead_behind(short_status_line):
-    # Example: "## main...origin/main [ahead 2, behind 1]"
-    ahead = behind = 0
-    if "[" in short_status_line and "]" in short_status_line:
-        bracket = short_status_line[short_status_line.index("[")+1 : short_status_line.index("]")]
-        parts = [p.strip() for p in bracket.split(",")]
-        for p in parts:
-            if p.startswith("ahead"):
-                try:
-                    ahead = int(p.split()[1])
-                except Exception:
-                    pass
-            if p.startswith("behind"):
-                try:
-                    behind = int(p.split()[1])
-                except Exception:
-                    pass
-    return ahead, behind
+            # HEAD is symbolic here, so this also names an unborn branch
+            head = repo.references["HEAD"].target
+            branch = head[11:] if head.startswith("refs/heads/") else head
+            ahead = behind = 0
+            if not repo.head_is_unborn:
+                upstream = repo.branches.local[branch].upstream
+                if upstream is not None:
+                    ahead, behind = repo.ahead_behind(repo.head.target, upstream.target)
+            state = (branch, ahead, behind)
+        flags = repo.status(untracked_files="normal" if untracked else "no")
+    except Exception:
+        return None
+    labels = {}
+    tracked, new = [], []
+    for name in sorted(flags):
+        f = flags[name]
+        label = labels.get(f)
+        if label is None:
+            label = labels[f] = _pygit2_status_label(f)
+        # git lists untracked entries after the tracked ones
+        (new if label == "Untracked" else tracked).append((label, name))
+    return state, tracked + new
+
+def read_local_branches(git_dir):
+    """
+    [[branch, sha], ...] read straight from packed-refs and the loose files under
+    refs/heads, sorted like for-each-ref. Returns None when the layout can't be
+    read this way (reftable, .git files, unreadable refs) so callers fall back to git.
+    """
+    if not os.path.isdir(git_dir) or os.path.exists(os.path.join(git_dir, "reftable")):
+        return None
+    refs = {}
+    try:
+        with open(os.path.join(git_dir, "packed-refs"), "rb") as f:
+            for line in f.read().splitlines():
+                sha, _, name = line.partition(b" ")
+                if name.startswith(b"refs/heads/"):
+                    refs[os.fsdecode(name[11:])] = sha.decode("ascii")
+    except FileNotFoundError:
+        pass
+    except OSError:
+        return None
+    heads = os.path.join(git_dir, "refs", "heads")
+    stack = [(heads, "")]
+    while stack:
+        d, prefix = stack.pop()
+        try:
+            with os.scandir(d) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        stack.append((e.path, prefix + e.name + "/"))
+                        continue
+                    if e.name.endswith(".lock"):
+                        continue  # ref update in progress
+                    with open(e.path, "rb") as f:
+                        sha = f.read().strip()
+                    if sha.startswith(b"ref:"):
+                        return None  # symbolic branch ref; let git resolve it
+                    refs[prefix + e.name] = sha.decode("ascii")
+        except FileNotFoundError:
+            continue
+        except (OSError, UnicodeDecodeError):
+            return None
+    return [[name, refs[name]] for name in sorted(refs)]
+
+class RefCache:
+    """
+    Local branch list cached in <repo>/.git/.gitmanager_cache, keyed by the
+    mtimes of HEAD, packed-refs and every directory under refs/heads. Git
+    updates refs by renaming lock files into place, which bumps the parent
+    directory's mtime, so an unchanged key means `for-each-ref` would return
+    the same list. The cache survives restarts.
+    """
+    FILENAME = ".gitmanager_cache"
+
+    def __init__(self, repo):
+        self.repo = repo
+        self.git_dir = os.path.join(repo, ".git")
+        self._cached = None
+
+    def key(self):
+        """mtime fingerprint of HEAD and the local refs, or None if it can't be taken."""
+        if not os.path.isdir(self.git_dir):
+            return None  # worktree/submodule .git files: don't cache
+        key = []
+        for name in ("HEAD", "packed-refs"):
+            try:
+                key.append(os.stat(os.path.join(self.git_dir, name)).st_mtime_ns)
+            except OSError:
+                key.append(0)
+        stack = [os.path.join(self.git_dir, "refs", "heads")]
+        while stack:
+            d = stack.pop()
+            try:
+                key.append(os.stat(d).st_mtime_ns)
+                with os.scandir(d) as it:
+                    stack.extend(e.path for e in it if e.is_dir(follow_symlinks=False))
+            except OSError:
+                key.append(0)
+        return key
+
+    def _load(self):
+        try:
+            with open(os.path.join(self.git_dir, self.FILENAME), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, data):
+        try:
+            with open(os.path.join(self.git_dir, self.FILENAME), "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        except OSError:
+            pass
+
+    def branches(self):
+        """Return [[branch, sha], ...] for local branches."""
+        key = self.key()
+        if key is not None:
+            if self._cached is None:
+                self._cached = self._load()
+            if self._cached and self._cached.get("key") == key:
+                return self._cached["refs"]
+        refs = read_local_branches(self.git_dir)
+        if refs is None:
+            refs = pygit2_branches(self.repo)
+        if refs is None:
+            out, _, rc = safe_run(_git_ro(["for-each-ref", "--format=%(refname:short) %(objectname)", "refs/heads/"]), cwd=self.repo)
+            if rc != 0:
+                return []
+            refs = [line.rsplit(" ", 1) for line in out.splitlines() if " " in line]
+        if key is not None:
+            self._cached = {"key": key, "refs": refs}
+            self._save(self._cached)
+        return refs
+
+class RepoWatcher:
+    """
+    Flags changes made to a repo outside the app (editor saves, git run from a
+    shell) using the optional watchdog package. Inside .git only the entries
+    a refresh reads are watched, so object writes, reflogs, lock files and our
+    own .gitmanager_cache don't trigger refreshes. With pygit2, worktree paths
+    matched by .gitignore (build output, caches) are skipped as well.
+    """
+    GIT_ENTRIES = frozenset(("HEAD", "index", "packed-refs", "refs", "config"))
+    # Open/close notifications (watchdog on inotify) fire for our own reads
+    EVENT_TYPES = frozenset(("created", "deleted", "modified", "moved"))
+
+    def __init__(self, repo, notify):
+        self.repo = repo
+        self.dirty = threading.Event()  # set from the first event of a burst until it is handled
+        self._notify = notify  # called with this watcher, on the observer's thread, when dirty gets set
+        self.last_event = 0.0
+        self.generation = 0  # bumped per relevant event; part of the status cache key
+        # Only used from the observer's thread
+        self._ignores = _pygit2_repo(repo)
+        handler = FileSystemEventHandler()
+        handler.on_any_event = self._on_event
+        self._observer = Observer()
+        self._observer.daemon = True
+        self._observer.schedule(handler, repo, recursive=True)
+        self._observer.start()
+
+    def _relevant(self, path, is_dir):
+        rel = os.path.relpath(path, self.repo)
+        parts = rel.split(os.sep, 2)
+        if parts[0] != ".git":
+            if self._ignores is None:
+                return True
+            rel = rel.replace(os.sep, "/") + ("/" if is_dir else "")
+            try:
+                return not self._ignores.path_is_ignored(rel)
+            except Exception:
+                return True
+        return len(parts) > 1 and parts[1] in self.GIT_ENTRIES and not parts[-1].endswith(".lock")
+
+    def _on_event(self, event):
+        if event.event_type not in self.EVENT_TYPES:
+            return
+        if event.is_directory and event.event_type == "modified":
+            return  # a child was added/removed; that event is handled on its own
+        paths = (event.src_path, getattr(event, "dest_path", ""))
+        if any(p and self._relevant(p, event.is_directory) for p in paths):
+            self.generation += 1
+            self.last_event = time.monotonic()
+            if not self.dirty.is_set():
+                self.dirty.set()
+                self._notify(self)
+
+    def stop(self):
+        self._observer.stop()
+
+def status_cache_key(git_dir, generation, *args):
+    """
+    Key under which a parsed status stays valid: the watcher's event count
+    plus the HEAD and index mtimes (commands run by the app change those
+    even between watcher events). None if they can't be read.
+    """
+    try:
+        return (generation, os.stat(os.path.join(git_dir, "HEAD")).st_mtime_ns,
+                os.stat(os.path.join(git_dir, "index")).st_mtime_ns) + args
+    except OSError:
+        return None
+
+# Status flag -> label; the labels are shared constants across every parsed row
+_STATUS_MAP = {
+    "M": "Modified",
+    "A": "Added",
+    "D": "Deleted",
+    "R": "Renamed",
+    "C": "Copied",
+    "U": "Unmerged",
+}
+
+# Label a row should show right after Stage / Unstage, where that's certain
+# from the label alone; the refresh that follows corrects everything else
+STAGED_STATUS = {"Untracked": "Added"}
+UNSTAGED_STATUS = {"Added": "Untracked"}
+
+def _xy_entry(xy):
+    # Index flag wins; unknown flags (e.g. 'T') are shown as-is
+    index_flag, wt_flag = xy.decode("ascii").replace(".", " ")
+    flag = index_flag if index_flag != " " else wt_flag
+    status = _STATUS_MAP.get(flag, flag) if flag != " " else "Changed"
+    return status, index_flag, wt_flag
+
+class _XYTable(dict):
+    """Raw v2 XY bytes -> (status, index_flag, worktree_flag); filled lazily for odd flags."""
+    def __missing__(self, xy):
+        entry = self[xy] = _xy_entry(xy)
+        return entry
+
+_XY_TO_STATUS = _XYTable(
+    (bytes([x, y]), _xy_entry(bytes([x, y]))) for x in b".MTADRCU" for y in b".MTADRCU"
+)
+
+def status_records(data):
+    """
+    Yield (status, path_bytes, index_flag, worktree_flag) for each entry of
+    'git status --porcelain=v2 -z' output (bytes). Records are NUL-terminated
+    and paths are never quoted; a rename ('2') record is followed by one extra
+    NUL-terminated field with the original path.
+    """
+    # '1' and 'u' records have fixed-width fields before the path (modes and
+    # object names), so the path offset is measured once per kind and reused.
+    path_at = {}
+    records = iter(data.split(b"\0"))
+    for rec in records:
+        kind = rec[:1]
+        if kind == b"?":
+            yield "Untracked", rec[2:], "?", "?"
+        elif kind == b"1" or kind == b"u":
+            start = path_at.get(kind)
+            if start is None:
+                start = path_at[kind] = len(rec) - len(rec.split(b" ", 8 if kind == b"1" else 10)[-1])
+            status, index_flag, wt_flag = _XY_TO_STATUS[rec[2:4]]
+            yield status, rec[start:], index_flag, wt_flag
+        elif kind == b"2":
+            # The rename score ("R100", "C75") varies in width, so split this one
+            _, index_flag, wt_flag = _XY_TO_STATUS[rec[2:4]]
+            next(records, None)  # skip origPath
+            yield "Renamed", rec.split(b" ", 9)[-1], index_flag, wt_flag
+        # else: '#' headers, '!' ignored entries and the trailing empty field
+
+def parse_status_porcelain(data):
+    """
+    Parse 'git status --porcelain=v2 -z' output (bytes) to list of dicts:
+    [{'path': 'file', 'status': 'Modified', 'index': 'M', 'worktree': ' '}, ...]
+    """
+    return [
+        {"path": os.fsdecode(path), "status": status, "index": index_flag, "worktree": wt_flag}
+        for status, path, index_flag, wt_flag in status_records(data)
+    ]
+
+def status_rows(data):
+    """(status, path) rows for the Changes list, without building a dict per entry."""
+    fsdecode = os.fsdecode
+    return [(status, fsdecode(path)) for status, path, _, _ in status_records(data)]
+
+def parse_branch_header(data):
+    """
+    Read (branch, ahead, behind) from the '# branch.*' records that lead
+    'git status --porcelain=v2 --branch -z' output, or None if there are none.
+    """
+    head, ahead, behind = None, 0, 0
+    pos = 0
+    # Headers always come first: walk them with find() rather than
+    # splitting the whole (possibly huge) status buffer
+    while data.startswith(b"# ", pos):
+        end = data.find(b"\0", pos)
+        if end < 0:
+            end = len(data)
+        key, _, value = data[pos + 2:end].partition(b" ")
+        pos = end + 1
+        if key == b"branch.head":
+            head = value.decode("utf-8", "replace")
+        elif key == b"branch.ab":
+            a, _, b = value.partition(b" ")
+            ahead, behind = int(a), -int(b)
+    if head is None:
+        return None
+    if head == "(detached)":
+        return "HEAD (no branch)", 0, 0
+    return head, ahead, behind
+
+def estimated_index_entries(git_dir):
+    """Entry count from the 12-byte .git/index header ("DIRC", version, count), or 0."""
+    try:
+        with open(os.path.join(git_dir, "index"), "rb") as f:
+            header = f.read(12)
+    except OSError:
+        return 0
+    if len(header) < 12 or header[:4] != b"DIRC":
+        return 0
+    return struct.unpack(">I", header[8:12])[0]
+
+def read_stash_entries(git_dir):
+    """
+    `git stash list` lines ("stash@{0}: On main: msg", newest first) read from
+    the stash reflog, or None if `git_dir` isn't a plain .git directory.
+    """
+    if not os.path.isdir(git_dir):
+        return None  # .git file (worktree/submodule): ask git instead
+    try:
+        with open(os.path.join(git_dir, "logs", "refs", "stash"), "rb") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return []
+    except OSError:
+        return None
+    messages = [line.partition(b"\t")[2].decode("utf-8", "replace") for line in reversed(lines) if line]
+    return [f"stash@{{{i}}}: {msg}" for i, msg in enumerate(messages)]
+
+def _stat_git(path):
+    """
+    (path_is_dir, git_is_dir) from one stat of `path`/.git in the usual case;
+    only a missing .git needs a second look to tell whether `path` exists.
+    Symlinks are followed, as os.path.isdir does.
+    """
+    try:
+        return True, stat.S_ISDIR(os.stat(os.path.join(path, ".git")).st_mode)
+    except FileNotFoundError:
+        return os.path.isdir(path), False  # no .git, or no `path` at all
+    except OSError:
+        return False, False  # ENOTDIR (`path` is a file) or unreadable
 
 def timestamp():
     return dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -129,10 +917,65 @@ class GitManagerApp(ttk.Frame):
         self.commits_to_show = tk.IntVar(value=50)
         self.stash_message = tk.StringVar(value="")
         self.stash_include_untracked = tk.BooleanVar(value=True)
-
-        # Async queue
-        self.result_queue = queue.Queue()
+        self.show_untracked = tk.BooleanVar(value=True)
+        self.stash_count = tk.StringVar(value="Stashes: –")
+        self.huge_repo_threshold = tk.IntVar(value=HUGE_REPO_THRESHOLD)
+        self.status_scope = tk.StringVar(value="")  # subfolder status is limited to; "" = whole repo
+
+        # Async runner: git commands run on an asyncio loop in a background
+        # thread; finished results come back through result_queue. A threaded
+        # Tcl accepts calls from other threads, so the loop wakes Tk directly;
+        # otherwise Tk polls the queue while work is in flight.
+        self.result_queue = queue.SimpleQueue()
+        self._direct_dispatch = self.master.tk.eval("info exists tcl_platform(threaded)") == "1"
         self.running_task = False
+        self._inflight = 0  # submitted coroutines whose results aren't applied yet
+        self._poll_id = None  # pending _poll_results; None while idle
+        self._poll_slow = False  # that poll is the watcher-only WATCH_DEBOUNCE_MS tick
+        self._pending_chains = collections.deque()  # run_git_chain calls waiting their turn
+        self._refresh_pending = None  # after() id of a coalesced refresh_all
+        self._refreshing = False  # a refresh is running on the asyncio loop
+        self._refresh_again = False  # another refresh was asked for meanwhile
+        self._refresh_rate = 0.0  # recent refresh requests, halving every second
+        self._refresh_last = 0.0  # monotonic time of the last request
+        self._refresh_first = 0.0  # first request of the pending burst
+        self._refresh_when_shown = False  # a refresh was skipped while minimized
+        self._log_dirty = False  # refresh skipped the log while its tab was hidden
+
+        # Last cwd that passed the isdir check in run_git_chain, and when
+        self._validated_repo = None
+        self._validated_at = 0.0
+        # Same for _repo_selected's .git check
+        self._validated_git_repo = None
+        self._validated_git_at = 0.0
+        # Any edit of the path (dialogs or typing) drops both
+        self.repo_path.trace_add("write", lambda *_: self._forget_validated_repo())
+        self.loop = asyncio.new_event_loop()
+        # Blocking reads (asyncio.to_thread) share one small pool of git workers
+        self.loop.set_default_executor(
+            concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="git-read")
+        )
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+
+        # Console writes waiting for _flush_log
+        self._log_pending = collections.deque()
+        self._log_pending_lines = 0  # newlines queued in _log_pending
+        self._log_flush_scheduled = False
+
+        # Persistent cat-file helper and branch cache for the current repo
+        self._session = None
+        self._log_generation = 0  # bumped per _show_log so stale appends stop
+        self._refresh_cache = {}  # repo -> (RefCache.key(), n, log rows) of the last refresh
+        self._status_cache = {}  # repo -> (status_cache_key(), parsed status) while watched
+        self._shown_log = None
+        self._repo_state = None  # branch + local branch names from the last refresh
+        self._stashes = None  # stash list read from the reflog on the last refresh
+        self._ref_cache = None
+        self._tree_rows = {}  # path -> status currently shown in the Changes list
+        self._shown_status_text = None  # status bar branch text last set by a refresh
+        self._shown_branches = None  # branch_combo values last set by a refresh
+        self._watcher = None  # RepoWatcher when watchdog is installed
+        self._watch_id = None
 
         # Build UI
         self._build_topbar()
@@ -141,6 +984,9 @@ class GitManagerApp(ttk.Frame):
 
         self._bind_shortcuts()
         self._load_global_config()
+        self.master.protocol("WM_DELETE_WINDOW", self._on_close)
+        # Picks up anything posted before mainloop started (e.g. the config read)
+        self.master.after(0, self._poll_results)
 
     # ---------------------------
     # UI Construction
@@ -221,18 +1067,21 @@ class GitManagerApp(ttk.Frame):
         self.tree.heading("path", text="Path")
         self.tree.column("status", width=110, anchor="w")
         self.tree.column("path", width=720, anchor="w")
-        self.tree.grid(row=0, column=0, columnspan=4, sticky="nsew")
+        self.tree.grid(row=0, column=0, columnspan=5, sticky="nsew")
 
         ttk.Button(self.changes_tab, text="Stage Selected", command=self.stage_selected, bootstyle="primary").grid(row=1, column=0, sticky="w", pady=(8,0))
         ttk.Button(self.changes_tab, text="Unstage Selected", command=self.unstage_selected, bootstyle="warning").grid(row=1, column=1, sticky="w", padx=6, pady=(8,0))
         ttk.Button(self.changes_tab, text="Discard Selected", command=self.discard_selected, bootstyle="danger-outline").grid(row=1, column=2, sticky="w", padx=6, pady=(8,0))
-        ttk.Button(self.changes_tab, text="Refresh", command=self.refresh_all, bootstyle="secondary-outline").grid(row=1, column=3, sticky="e", pady=(8,0))
+        # Untracked scanning is the most expensive part of git status on big trees
+        ttk.Checkbutton(self.changes_tab, text="Show untracked", variable=self.show_untracked, command=self._schedule_refresh).grid(row=1, column=3, sticky="e", padx=6, pady=(8,0))
+        ttk.Button(self.changes_tab, text="Refresh", command=self.refresh_all, bootstyle="secondary-outline").grid(row=1, column=4, sticky="e", pady=(8,0))
 
         self.changes_tab.grid_rowconfigure(0, weight=1)
         self.changes_tab.grid_columnconfigure(0, weight=1)
         self.changes_tab.grid_columnconfigure(1, weight=0)
         self.changes_tab.grid_columnconfigure(2, weight=0)
         self.changes_tab.grid_columnconfigure(3, weight=0)
+        self.changes_tab.grid_columnconfigure(4, weight=0)
 
         # Commits tab
         self.log_tab = ttk.Frame(self.tabs, padding=8)
@@ -245,7 +1094,9 @@ class GitManagerApp(ttk.Frame):
         ttk.Button(topbar, text="Refresh Log", command=self.load_log, bootstyle="secondary-outline").pack(side=tk.LEFT)
         ttk.Button(topbar, text="Revert Selected SHA", command=self.revert_selected_sha, bootstyle="danger-outline").pack(side=tk.LEFT, padx=8)
 
-        self.log_list = ttk.Treeview(self.log_tab, columns=("sha", "msg"), show="headings", height=16, bootstyle="dark")
+        # "full" holds the 40-char SHA (also the row iid); only the short form is shown
+        self.log_list = ttk.Treeview(self.log_tab, columns=("full", "sha", "msg"), displaycolumns=("sha", "msg"),
+                                     show="headings", height=16, bootstyle="dark")
         self.log_list.heading("sha", text="SHA")
         self.log_list.heading("msg", text="Message")
         self.log_list.column("sha", width=100, anchor="w")
@@ -354,6 +1205,7 @@ class GitManagerApp(ttk.Frame):
         ttk.Entry(s, textvariable=self.stash_message, width=28).grid(row=row, column=1, sticky="we", padx=6); row += 1
 
         ttk.Checkbutton(s, text="Include untracked (-u)", variable=self.stash_include_untracked).grid(row=row, column=0, columnspan=2, sticky="w", pady=(6,0)); row += 1
+        ttk.Label(s, textvariable=self.stash_count, bootstyle="secondary").grid(row=row, column=0, columnspan=2, sticky="w", pady=(6,0)); row += 1
 
         ttk.Button(s, text="Stash Save", command=self.stash_save, bootstyle="secondary-outline").grid(row=row, column=0, sticky="we"); 
         ttk.Button(s, text="Stash Pop", command=self.stash_pop, bootstyle="secondary-outline").grid(row=row, column=1, sticky="we", padx=6); row += 1
@@ -368,12 +1220,47 @@ class GitManagerApp(ttk.Frame):
         ttk.Entry(g, textvariable=self.user_name, width=28).grid(row=row, column=1, sticky="we", padx=6); row += 1
         ttk.Label(g, text="User Email").grid(row=row, column=0, sticky="w", pady=(6,0))
         ttk.Entry(g, textvariable=self.user_email, width=28).grid(row=row, column=1, sticky="we", padx=6, pady=(6,0)); row += 1
-        ttk.Button(g, text="Set Global Config", command=self.set_config, bootstyle="secondary").grid(row=row, column=0, columnspan=2, pady=(10,0), sticky="we")
+        ttk.Button(g, text="Set Global Config", command=self.set_config, bootstyle="secondary").grid(row=row, column=0, columnspan=2, pady=(10,0), sticky="we"); row += 1
+        ttk.Label(g, text="Huge repo above (files)").grid(row=row, column=0, sticky="w", pady=(10,0))
+        ttk.Spinbox(g, from_=10_000, to=10_000_000, increment=10_000, textvariable=self.huge_repo_threshold, width=10).grid(row=row, column=1, sticky="w", padx=6, pady=(10,0)); row += 1
+        ttk.Label(g, text="Status scope (subfolder)").grid(row=row, column=0, sticky="w", pady=(6,0))
+        ttk.Entry(g, textvariable=self.status_scope, width=28).grid(row=row, column=1, sticky="we", padx=6, pady=(6,0)); row += 1
+        self.status_scope.trace_add("write", lambda *_: self._schedule_refresh())
 
         g.grid_columnconfigure(1, weight=1)
 
     def _bind_shortcuts(self):
         self.master.bind("<Control-Return>", lambda e: self.commit_changes())
+        self.tabs.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        self.master.bind("<Map>", self._on_map, add="+")
+
+    def _log_visible(self):
+        return self.tabs.select() == str(self.log_tab)
+
+    def _on_tab_changed(self, event=None):
+        # Refreshes skip the log while its tab is hidden; catch up on first view
+        if self._log_dirty and self._log_visible() and self.repo_path.get().strip():
+            self.load_log()
+
+    def _on_map(self, event):
+        # The toplevel's bindings also fire for every child widget being mapped
+        if event.widget is self.master and self._refresh_when_shown:
+            self._refresh_when_shown = False
+            self._schedule_refresh()
+
+    def _on_close(self):
+        if self._poll_id is not None:
+            self.master.after_cancel(self._poll_id)
+        if self._refresh_pending is not None:
+            self.master.after_cancel(self._refresh_pending)
+        if self._watch_id is not None:
+            self.master.after_cancel(self._watch_id)
+        if self._watcher:
+            self._watcher.stop()
+        if self._session:
+            self._session.close()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.master.destroy()
 
     # ---------------------------
     # Repo Utilities
@@ -383,16 +1270,16 @@ class GitManagerApp(ttk.Frame):
         path = filedialog.askdirectory()
         if path:
             self.repo_path.set(path)
-            self.refresh_all()
+            self._schedule_refresh()
 
     def open_folder(self):
         path = self.repo_path.get().strip()
         if not path:
             messagebox.showinfo("Open Folder", "Select a repository folder first.")
             return
-        if is_windows():
+        if IS_WINDOWS:
             os.startfile(path)
-        elif sys.platform == "darwin":
+        elif IS_MACOS:
             subprocess.Popen(["open", path])
         else:
             subprocess.Popen(["xdg-open", path])
@@ -403,20 +1290,21 @@ class GitManagerApp(ttk.Frame):
             messagebox.showinfo("Open Terminal", "Select a repository folder first.")
             return
         try:
-            if is_windows():
-                cmd = ["wt.exe", "-d", path] if shutil.which("wt.exe") else ["cmd.exe", "/K", f"cd /d {path}"]
-                subprocess.Popen(cmd)
-            elif sys.platform == "darwin":
-                script = f'tell application "Terminal" to do script "cd {shlex.quote(path)}"'
-                subprocess.Popen(["osascript", "-e", script])
+            # Start the terminal in the repo via cwd/argv so the path is never
+            # re-parsed by a shell.
+            if IS_WINDOWS:
+                cmd = ["wt.exe", "-d", path] if _which("wt.exe") else ["cmd.exe", "/K"]
+                subprocess.Popen(cmd, cwd=path)
+            elif IS_MACOS:
+                subprocess.Popen(["open", "-a", "Terminal", path])
             else:
-                term = shutil.which("gnome-terminal") or shutil.which("konsole") or shutil.which("xterm")
+                term = _which("gnome-terminal") or _which("konsole") or _which("xterm")
                 if term and "gnome-terminal" in term:
-                    subprocess.Popen([term, "--", "bash", "-lc", f"cd {shlex.quote(path)}; exec bash"])
+                    subprocess.Popen([term, "--working-directory", path], cwd=path)
                 elif term and "konsole" in term:
-                    subprocess.Popen([term, "--workdir", path])
+                    subprocess.Popen([term, "--workdir", path], cwd=path)
                 elif term and "xterm" in term:
-                    subprocess.Popen([term, "-e", f"bash -lc 'cd {shlex.quote(path)}; exec bash'"])
+                    subprocess.Popen([term], cwd=path)
                 else:
                     messagebox.showinfo("Open Terminal", "No supported terminal found; opening folder instead.")
                     subprocess.Popen(["xdg-open", path])
@@ -427,22 +1315,26 @@ class GitManagerApp(ttk.Frame):
     # Async Command Runners
     # ---------------------------
 
-    def run_git_async(self, args, cwd=None, label=None, refresh=False):
-        """Run a single git command asynchronously."""
-        self.run_git_chain([args], cwd=cwd, label=label, refresh=refresh)
+    def run_git_async(self, args, cwd=None, label=None, refresh=False, stdin=None):
+        """Run a single git command asynchronously, optionally feeding it `stdin` bytes."""
+        command = args if stdin is None else (args, stdin)
+        self.run_git_chain([command], cwd=cwd, label=label, refresh=refresh)
 
     def run_git_chain(self, commands, cwd=None, label=None, refresh=False):
         """
         Run a sequence of git commands asynchronously as one task.
-        `commands` is a list of arg lists: [["git","add","-A"], ["git","commit","-m","msg"]]
+        `commands` is a list of arg lists: [["git","add","-A"], ["git","commit","-m","msg"]];
+        an entry may also be an (args, stdin_bytes) tuple.
         """
         if not cwd:
             cwd = self.repo_path.get().strip() or None
-        if cwd and not os.path.isdir(cwd):
+        if cwd and not self._cwd_valid(cwd):
             self._log(f"[{timestamp()}] ERROR: Invalid repository path: {cwd}\n", is_err=True)
             return
         if self.running_task:
-            self._log("Another operation is still running. Please wait…\n")
+            # Run after the current task, in the order requested
+            self._pending_chains.append((commands, cwd, label, refresh))
+            self._log(f"Queued: {label or 'git command'}\n")
             return
 
         self.running_task = True
@@ -450,40 +1342,171 @@ class GitManagerApp(ttk.Frame):
         if label:
             self._set_status(label)
 
-        def worker():
-            full_log = ""
-            final_rc = 0
-            for args in commands:
-                out, err, rc = safe_run(args, cwd=cwd)
-                cmd_str = " ".join(shlex.quote(a) for a in args)
-                full_log += f"\n$ {cmd_str}\n"
-                if out:
-                    full_log += out
-                if err:
-                    full_log += err
-                final_rc = rc
-                if rc != 0:
-                    break
-            self.result_queue.put((full_log, final_rc, refresh))
-
-        threading.Thread(target=worker, daemon=True).start()
-        self.master.after(60, self._poll_results)
+        self._submit(self._run_chain(commands, cwd, refresh))
+
+    def _submit(self, coro):
+        """Schedule `coro` on the asyncio loop; its result callback must decrement _inflight."""
+        self._inflight += 1
+        if not self._direct_dispatch and (self._poll_id is None or self._poll_slow):
+            if self._poll_id is not None:
+                self.master.after_cancel(self._poll_id)
+            self._poll_id = self.master.after(10, self._poll_results)
+            self._poll_slow = False
+        asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def _post(self, callback, args):
+        """Hand `callback(*args)` from the asyncio loop to the Tk thread."""
+        self.result_queue.put((callback, args))
+        if self._direct_dispatch:
+            try:
+                self.master.after_idle(self._poll_results)
+            except (RuntimeError, tk.TclError):
+                pass  # window already closed
+
+    def _cwd_valid(self, cwd):
+        """isdir(cwd), re-probed at most every VALIDATED_REPO_TTL seconds for the same path."""
+        now = time.monotonic()
+        if cwd == self._validated_repo and now - self._validated_at < VALIDATED_REPO_TTL:
+            return True
+        # A repo _repo_selected just checked has a .git inside, so it is a directory
+        if cwd == self._validated_git_repo and now - self._validated_git_at < VALIDATED_REPO_TTL:
+            return True
+        if not os.path.isdir(cwd):
+            self._validated_repo = None
+            return False
+        self._validated_repo, self._validated_at = cwd, now
+        return True
+
+    def _forget_validated_repo(self):
+        self._validated_repo = None
+        self._validated_git_repo = None
+        self._repo_state = None
+
+    def _call_in_background(self, func, args, callback, *extra):
+        """
+        Run blocking `func(*args)` on the worker pool, then `callback(result, *extra)` on the Tk thread.
+        If `func` raises, the error goes to the console and `callback` is skipped.
+        """
+        async def call():
+            result = error = None
+            try:
+                result = await asyncio.to_thread(func, *args)
+            except Exception as e:
+                error = e
+            finally:
+                # Always posted, so _inflight drops back and the poll loop can stop
+                self._post(self._finish_background_call, (callback, result, error) + extra)
+
+        self._submit(call())
+
+    def _finish_background_call(self, callback, result, error, *extra):
+        self._inflight -= 1
+        if error is not None:
+            self._log(f"[{timestamp()}] ERROR: {error}\n", is_err=True)
+            return
+        callback(result, *extra)
+
+    async def _run_chain(self, commands, cwd, refresh):
+        """Coroutine body of run_git_chain; runs on the background asyncio loop."""
+        steps = []
+        final_rc = 0
+        for command in commands:
+            args, stdin = command if isinstance(command, tuple) else (command, None)
+            out, err, rc = await async_run(args, cwd=cwd, text=False, stdin=stdin)
+            steps.append((args, out, err))
+            final_rc = rc
+            if rc != 0:
+                break
+        self._post(self._on_chain_done, (steps, final_rc, refresh))
+
+    def _on_chain_done(self, steps, rc, refresh):
+        self._inflight -= 1
+        self.progress.stop()
+        self.running_task = False
+        # Command lines are formatted and output decoded only here, on their way into the console
+        parts = []
+        for args, out, err in steps:
+            parts.append(f"\n$ {format_cmd(args)}\n")
+            if out:
+                parts.append(out.decode("utf-8", "replace"))
+            if err:
+                parts.append(err.decode("utf-8", "replace"))
+        self._log("".join(parts), is_err=(rc != 0))
+        self._set_status(f"Done ({'OK' if rc == 0 else 'Error'})")
+        if refresh:
+            self._refresh_cache.clear()
+            self._status_cache.clear()
+            self._schedule_refresh()
+        if self._pending_chains:
+            self.run_git_chain(*self._pending_chains.popleft())
 
     def _poll_results(self):
+        """
+        Single Tk integration point: drain finished tasks from the asyncio side.
+        Each queue entry is a (callback, args) pair to run on the Tk thread.
+        Runs when _post wakes it, or without threaded Tcl, ticks every 10 ms
+        while anything submitted is in flight, every WATCH_DEBOUNCE_MS while
+        only a file watcher may post, and stops when idle.
+        """
+        self._poll_id = None
         try:
-            full_log, rc, refresh = self.result_queue.get_nowait()
-            self.progress.stop()
-            self.running_task = False
-            self._log(full_log, is_err=(rc != 0))
-            self._set_status(f"Done ({'OK' if rc == 0 else 'Error'})")
-            if refresh:
-                self.refresh_all()
+            while True:
+                callback, args = self.result_queue.get_nowait()
+                callback(*args)
         except queue.Empty:
-            self.master.after(60, self._poll_results)
+            pass
+        if not self._direct_dispatch and self._poll_id is None:
+            if self._inflight:
+                self._poll_id = self.master.after(10, self._poll_results)
+                self._poll_slow = False
+            elif self._watcher:
+                self._poll_id = self.master.after(WATCH_DEBOUNCE_MS, self._poll_results)
+                self._poll_slow = True
 
     def _log(self, text, is_err=False):
-        self.console.insert(tk.END, text)
-        self.console.see(tk.END)
+        """Queue console output; bursts are written by _flush_log when Tk is idle."""
+        if not text:
+            return
+        pending = self._log_pending
+        pending.append(text)
+        self._log_pending_lines += text.count("\n")
+        # Drop queued output that would scroll straight out of the capped console
+        while self._log_pending_lines > CONSOLE_MAX_LINES:
+            head = pending[0]
+            lines = head.count("\n")
+            excess = self._log_pending_lines - CONSOLE_MAX_LINES
+            if lines <= excess:
+                pending.popleft()
+                self._log_pending_lines -= lines
+            else:
+                pending[0] = head.split("\n", excess)[excess]
+                self._log_pending_lines -= excess
+        if not self._log_flush_scheduled:
+            self._log_flush_scheduled = True
+            self.master.after_idle(self._flush_log)
+
+    def _flush_log(self):
+        # Insert at most LOG_FLUSH_CHARS per idle slot so huge outputs don't block a frame
+        budget = LOG_FLUSH_CHARS
+        parts = []
+        while self._log_pending and budget > 0:
+            text = self._log_pending.popleft()
+            if len(text) > budget:
+                self._log_pending.appendleft(text[budget:])
+                text = text[:budget]
+            parts.append(text)
+            budget -= len(text)
+            self._log_pending_lines -= text.count("\n")
+        self.console.insert(tk.END, "".join(parts))
+        # Keep only the newest CONSOLE_MAX_LINES lines
+        overflow = int(self.console.index("end-1c").split(".")[0]) - CONSOLE_MAX_LINES
+        if overflow > 0:
+            self.console.delete("1.0", f"{overflow + 1}.0")
+        if self._log_pending:
+            self.master.after_idle(self._flush_log)
+        else:
+            self._log_flush_scheduled = False
+            self.console.see(tk.END)
 
     def _set_status(self, text):
         self.status_left.configure(text=text)
@@ -493,12 +1516,30 @@ class GitManagerApp(ttk.Frame):
     # ---------------------------
 
     def _load_global_config(self):
-        out, _, rc = safe_run(["git", "config", "--global", "user.name"])
-        if rc == 0 and out.strip():
-            self.user_name.set(out.strip())
-        out, _, rc = safe_run(["git", "config", "--global", "user.email"])
-        if rc == 0 and out.strip():
-            self.user_email.set(out.strip())
+        cached = load_cached_identity()
+        if cached:
+            self._set_identity(*cached)
+            return
+        # Read on the asyncio loop so the window paints without waiting on git
+        self._submit(self._load_global_config_async())
+
+    async def _load_global_config_async(self):
+        results = await asyncio.gather(
+            asyncio.to_thread(read_global_config, "user.name"),
+            asyncio.to_thread(read_global_config, "user.email"),
+        )
+        self._post(self._apply_global_config, results)
+
+    def _apply_global_config(self, name, email):
+        self._inflight -= 1
+        save_cached_identity(name, email)
+        self._set_identity(name, email)
+
+    def _set_identity(self, name, email):
+        if name:
+            self.user_name.set(name)
+        if email:
+            self.user_email.set(email)
 
     def set_config(self):
         name = self.user_name.get().strip()
@@ -506,6 +1547,7 @@ class GitManagerApp(ttk.Frame):
         if not name or not email:
             messagebox.showwarning("Config", "User name and email are required.")
             return
+        invalidate_cache()
         self.run_git_chain(
             [
                 ["git", "config", "--global", "user.name", name],
@@ -529,6 +1571,7 @@ class GitManagerApp(ttk.Frame):
         dest = filedialog.askdirectory(title="Select destination folder for clone")
         if not dest:
             return
+        self._forget_validated_repo()
         self.run_git_async(["git", "clone", url], cwd=dest, label="Cloning repository", refresh=True)
 
     def commit_changes(self):
@@ -538,11 +1581,21 @@ class GitManagerApp(ttk.Frame):
         if not msg:
             messagebox.showwarning("Commit", "Please enter a commit message.")
             return
-        chain = []
-        if self.stage_all.get():
-            chain.append(["git", "add", "-A"])
-        chain.append(["git", "commit", "-m", msg])
-        self.run_git_chain(chain, label="Committing changes", refresh=True)
+        if not self.stage_all.get():
+            self.run_git_chain([["git", "commit", "-m", msg]], label="Committing changes", refresh=True)
+        elif self._untracked_scan_current():
+            # Nothing untracked on the last scan: -a stages the same set as add -A
+            self.run_git_chain([["git", "commit", "-a", "-m", msg]], label="Committing changes", refresh=True)
+        else:
+            self.run_git_chain([["git", "add", "-A"], ["git", "commit", "-m", msg]], label="Committing changes", refresh=True)
+
+    def _untracked_scan_current(self):
+        """True when the last scan found no untracked files and the watcher has seen no edits since."""
+        state, watcher = self._repo_state, self._watcher
+        # Without a watcher (or with one for another repo) a new file leaves no trace
+        if not state or state["untracked"] is not False or state["generation"] is None:
+            return False
+        return watcher is not None and watcher.repo == state["path"] and watcher.generation == state["generation"]
 
     def amend_commit(self):
         if not self._repo_selected():
@@ -582,8 +1635,9 @@ class GitManagerApp(ttk.Frame):
             return
         self.run_git_chain(
             [
-                ["git", "fetch", "origin"],
-                ["git", "reset", "--hard", f"origin/{br}"],
+                # Fetch only the target branch rather than every ref on origin
+                ["git", "fetch", "origin", br],
+                ["git", "reset", "--hard", "FETCH_HEAD"],
             ],
             label=f"Reset to origin/{br}",
             refresh=True
@@ -632,6 +1686,9 @@ class GitManagerApp(ttk.Frame):
         if br == self.current_branch.get().strip():
             messagebox.showwarning("Delete Branch", "Cannot delete the current branch.")
             return
+        if self._repo_state and br not in self._repo_state["branches"]:
+            messagebox.showwarning("Delete Branch", f"There is no local branch named '{br}'.")
+            return
         if not messagebox.askyesno("Delete Branch", f"Delete branch '{br}'? (Unmerged work may be lost)"):
             return
         self.run_git_async(["git", "branch", "-D", br], label=f"Deleting {br}", refresh=True)
@@ -664,6 +1721,10 @@ class GitManagerApp(ttk.Frame):
     def stash_list(self):
         if not self._repo_selected():
             return
+        if self._stashes is not None:
+            # No command runs here, so don't echo one
+            self._log("\nStashes (from last refresh):\n" + "".join(line + "\n" for line in self._stashes))
+            return
         self.run_git_async(["git", "stash", "list"], label="Stash list", refresh=False)
 
     def stage_selected(self):
@@ -673,8 +1734,14 @@ class GitManagerApp(ttk.Frame):
         if not items:
             messagebox.showinfo("Stage", "Select one or more files in the Changes list.")
             return
-        paths = [self.tree.set(i, "path") for i in items]
-        self.run_git_async(["git", "add"] + paths, label=f"Staging {len(paths)} file(s)", refresh=True)
+        paths = list(items)  # row iids are the paths
+        self._predict_rows(paths, STAGED_STATUS)
+        self.run_git_async(
+            ["git", "add", "--pathspec-from-file=-", "--pathspec-file-nul"],
+            label=f"Staging {len(paths)} file(s)",
+            refresh=True,
+            stdin=pathspec_bytes(paths),
+        )
 
     def unstage_selected(self):
         if not self._repo_selected():
@@ -683,8 +1750,24 @@ class GitManagerApp(ttk.Frame):
         if not items:
             messagebox.showinfo("Unstage", "Select one or more files in the Changes list.")
             return
-        paths = [self.tree.set(i, "path") for i in items]
-        self.run_git_async(["git", "restore", "--staged"] + paths, label=f"Unstaging {len(paths)} file(s)", refresh=True)
+        paths = list(items)  # row iids are the paths
+        self._predict_rows(paths, UNSTAGED_STATUS)
+        self.run_git_async(
+            ["git", "restore", "--staged", "--pathspec-from-file=-", "--pathspec-file-nul"],
+            label=f"Unstaging {len(paths)} file(s)",
+            refresh=True,
+            stdin=pathspec_bytes(paths),
+        )
+
+    def _predict_rows(self, paths, transitions):
+        """Show the expected status of `paths` now instead of after the refresh round-trip."""
+        shown = self._tree_rows
+        for path in paths:
+            # Merged rows ("Deleted, Untracked") have no entry; the refresh shows them
+            status = transitions.get(shown.get(path))
+            if status:
+                self.tree.set(path, "status", status)
+                shown[path] = status  # populate_tree diffs against this, fixing wrong guesses
 
     def discard_selected(self):
         if not self._repo_selected():
@@ -693,33 +1776,71 @@ class GitManagerApp(ttk.Frame):
         if not items:
             messagebox.showinfo("Discard", "Select one or more files in the Changes list.")
             return
-        paths = [self.tree.set(i, "path") for i in items]
+        paths = list(items)  # row iids are the paths
         if not messagebox.askyesno("Discard Changes", f"This will discard local changes in {len(paths)} file(s).\nThis cannot be undone. Continue?"):
             return
-        # Use modern restore to reset working tree files
-        self.run_git_async(["git", "restore", "--worktree", "--source=HEAD", "--"] + paths, label=f"Discarding {len(paths)} file(s)", refresh=True)
+        # Use modern restore to reset working tree files; paths go over stdin so
+        # large selections can't hit the argv length limit
+        self.run_git_async(
+            ["git", "restore", "--worktree", "--source=HEAD", "--pathspec-from-file=-", "--pathspec-file-nul"],
+            label=f"Discarding {len(paths)} file(s)",
+            refresh=True,
+            stdin=pathspec_bytes(paths),
+        )
 
     def load_log(self):
         if not self._repo_selected():
             return
+        self._log_dirty = False
         n = self.commits_to_show.get()
-        out, err, rc = safe_run(["git", "log", f"--pretty=%h|%s", f"-{n}"], cwd=self.repo_path.get())
-        # Update treeview
-        for i in self.log_list.get_children():
-            self.log_list.delete(i)
-        if rc == 0 and out:
-            for line in out.splitlines():
-                if "|" in line:
-                    sha, msg = line.split("|", 1)
-                    self.log_list.insert("", tk.END, values=(sha.strip(), msg.strip()))
-        elif err:
+        self._submit(self._load_log_async(self._refs(), self._git_session(), n, self.repo_path.get().strip()))
+
+    async def _load_log_async(self, refs, session, n, path):
+        log = error = None
+        try:
+            log = await asyncio.to_thread(self._cached_log_rows, refs, session, n, path)
+        except Exception as e:
+            error = e
+        finally:
+            self._post(self._apply_log, (log, error))
+
+    def _apply_log(self, log, error=None):
+        self._inflight -= 1
+        if error is not None:
+            self._log(f"[{timestamp()}] ERROR: Could not load the log: {error}\n", is_err=True)
+            self._log_dirty = True  # retried the next time the Commits tab is shown
+            return
+        self._apply_refresh_log(log)
+
+    def _show_log(self, rows, err="", rc=0):
+        if rc != 0 and err:
             self._log(err + "\n", is_err=True)
+        # First chunk replaces the list; the rest are appended when Tk is idle
+        self._log_generation += 1
+        self._bulk_update(self.log_list, rows[:LOG_CHUNK_ROWS], iid_col=0)
+        if len(rows) > LOG_CHUNK_ROWS:
+            self.master.after_idle(self._append_log_rows, rows, LOG_CHUNK_ROWS, self._log_generation)
+
+    def _append_log_rows(self, rows, start, generation):
+        if generation != self._log_generation:
+            return  # a newer log load replaced the list
+        end = start + LOG_CHUNK_ROWS
+        insert = self.log_list.insert
+        displaycolumns = self.log_list["displaycolumns"]
+        self.log_list.configure(displaycolumns=())
+        try:
+            for values in rows[start:end]:
+                insert("", tk.END, iid=values[0], values=values)
+        finally:
+            self.log_list.configure(displaycolumns=displaycolumns)
+        if end < len(rows):
+            self.master.after_idle(self._append_log_rows, rows, end, generation)
 
     def copy_selected_sha(self):
         sel = self.log_list.selection()
         if not sel:
             return
-        sha = self.log_list.set(sel[0], "sha")
+        sha = sel[0]  # row iids are the full SHAs
         self.master.clipboard_clear()
         self.master.clipboard_append(sha)
         self._set_status(f"Copied SHA: {sha}")
@@ -731,16 +1852,30 @@ class GitManagerApp(ttk.Frame):
         if not sel:
             messagebox.showinfo("Revert", "Select a commit SHA in the Commits tab.")
             return
-        sha = self.log_list.set(sel[0], "sha")
+        sha = sel[0]  # row iids are the full SHAs
+        self._call_in_background(self._git_session().resolve, (sha, "commit"), self._confirm_revert, sha)
+
+    def _confirm_revert(self, resolved, sha):
+        if resolved is None:
+            messagebox.showerror("Revert", f"Commit {sha} no longer exists in this repository.")
+            return
         if not messagebox.askyesno("Revert Commit", f"Create a new commit that reverts {sha}?"):
             return
         self.run_git_async(["git", "revert", sha], label=f"Reverting {sha}", refresh=True)
 
     # Console helpers
+    def _iter_console_chunks(self, lines=2000):
+        """Yield the console text a block of lines at a time instead of as one string."""
+        last = int(self.console.index("end-1c").split(".")[0])
+        for start in range(1, last + 1, lines):
+            yield self.console.get(f"{start}.0", f"{start + lines}.0")
+
     def copy_console(self):
-        text = self.console.get("1.0", tk.END)
-        self.master.clipboard_clear()
-        self.master.clipboard_append(text)
+        # Raw Tcl calls: clipboard_append rebuilds its option tuple on every chunk
+        call = self.master.tk.call
+        call("clipboard", "clear", "-displayof", self.master)
+        for chunk in self._iter_console_chunks():
+            call("clipboard", "append", "-displayof", self.master, "--", chunk)
         self._set_status("Console copied")
 
     def clear_console(self):
@@ -755,70 +1890,325 @@ class GitManagerApp(ttk.Frame):
         if not fname:
             return
         with open(fname, "w", encoding="utf-8") as f:
-            f.write(self.console.get("1.0", tk.END))
+            for chunk in self._iter_console_chunks():
+                f.write(chunk)
         self._set_status(f"Exported log to {os.path.basename(fname)}")
 
     # ---------------------------
     # Refresh / Status
     # ---------------------------
 
+    def _schedule_refresh(self):
+        """
+        Coalesce bursts of refresh requests (e.g. Stage, Unstage, Discard) into
+        one refresh_all. Each request pushes the refresh back; the delay grows
+        with the recent request rate, capped by REFRESH_MAX_WAIT_MS overall.
+        """
+        now = time.monotonic()
+        self._refresh_rate = self._refresh_rate * 0.5 ** (now - self._refresh_last) + 1
+        self._refresh_last = now
+        if self._refresh_pending is None:
+            self._refresh_first = now
+        else:
+            self.master.after_cancel(self._refresh_pending)
+        delay = min(REFRESH_DEBOUNCE_MS * self._refresh_rate, REFRESH_DEBOUNCE_MAX_MS,
+                    REFRESH_MAX_WAIT_MS - (now - self._refresh_first) * 1000)
+        self._refresh_pending = self.master.after(max(int(delay), 0), self._do_refresh)
+
+    def _do_refresh(self):
+        self._refresh_pending = None
+        if not self.master.winfo_viewable():
+            # Minimized: nobody sees the result, so refresh once on <Map>
+            self._refresh_when_shown = True
+            return
+        self.refresh_all()
+
     def refresh_all(self):
+        if self._refreshing:
+            # Results in flight would be stale; run once more when they land
+            self._refresh_again = True
+            return
         path = self.repo_path.get().strip()
-        if not path or not os.path.isdir(path):
+        if not path or not (path == self._validated_git_repo or _stat_git(path)[0]):
             return
+        session = None
+        if self._log_visible():
+            session = self._git_session() if self._repo_selected() else None
+            self._log_dirty = False
+        else:
+            self._log_dirty = True  # read when the Commits tab is shown
+        self._watch_repo(path)
+        refs = self._refs()
+        n = self.commits_to_show.get()
+        untracked = "-unormal" if self.show_untracked.get() else "-uno"
+        scope = self.status_scope.get().strip()
+        try:
+            threshold = self.huge_repo_threshold.get()
+        except tk.TclError:
+            threshold = HUGE_REPO_THRESHOLD
+        # Without a watcher an edited file leaves no trace in .git, so status
+        # results are only reused while one is running for this repo
+        watcher = self._watcher
+        generation = watcher.generation if watcher and watcher.repo == path else None
+        self._refreshing = True
+        self._submit(self._refresh_async(path, refs, session, n, untracked, threshold, generation, scope))
+
+    def _watch_repo(self, path):
+        """Point the file watcher at `path`, so outside edits refresh without a button press."""
+        if Observer is None or (self._watcher and self._watcher.repo == path):
+            return
+        if self._watcher:
+            self._watcher.stop()
+            self._watcher = None
+        try:
+            # The observer thread hands events to Tk through the result queue
+            self._watcher = RepoWatcher(path, lambda watcher: self._post(self._on_watch_event, (watcher,)))
+        except OSError:
+            return  # e.g. out of inotify watches; manual refresh still works
+        if not self._direct_dispatch and self._poll_id is None:
+            self._poll_id = self.master.after(WATCH_DEBOUNCE_MS, self._poll_results)
+            self._poll_slow = True
+
+    def _on_watch_event(self, watcher):
+        """A burst of file events began; refresh once it has been quiet for WATCH_DEBOUNCE_MS."""
+        if watcher is self._watcher and self._watch_id is None:
+            self._watch_id = self.master.after(WATCH_DEBOUNCE_MS, self._check_watcher)
+
+    def _check_watcher(self):
+        self._watch_id = None
+        watcher = self._watcher
+        if not (watcher and watcher.dirty.is_set()):
+            return
+        quiet_ms = (time.monotonic() - watcher.last_event) * 1000
+        if quiet_ms >= WATCH_DEBOUNCE_MS:
+            watcher.dirty.clear()  # the next event posts again
+            self._schedule_refresh()
+        else:
+            self._watch_id = self.master.after(int(WATCH_DEBOUNCE_MS - quiet_ms) + 1, self._check_watcher)
+
+    async def _refresh_async(self, path, refs, session, n, untracked="-unormal", threshold=HUGE_REPO_THRESHOLD, generation=None, scope=""):
+        """Run the independent refresh reads concurrently, applying each on the Tk thread as it lands."""
+        # Huge repos (by index size) skip the untracked walk, like shell prompts do
+        git_dir = os.path.join(path, ".git")
+        huge = estimated_index_entries(git_dir) > threshold
+        stashes = read_stash_entries(git_dir)
+        if huge:
+            untracked = "-uno"
+        status_args = ["status", "--porcelain=v2", "--branch", "-z", untracked, "--ignore-submodules=dirty"]
+        if scope:
+            # Only this subtree is scanned; the branch headers are unaffected
+            status_args += ["--", scope]
+
+        async def read_status():
+            # Taken before reading, so edits made meanwhile change the key
+            key = status_cache_key(git_dir, generation, untracked, scope) if generation is not None else None
+            cached = self._status_cache.get(path)
+            if key is not None and cached and cached[0] == key:
+                return cached[1]
+            result = await read_fresh_status()
+            if key is not None and result is not None:
+                self._status_cache[path] = (key, result)
+            return result
+
+        async def read_fresh_status():
+            # libgit2 skips the git exec on normal-sized trees; huge ones keep
+            # git, whose untracked cache and fsmonitor support pay off there
+            if not huge and not scope:
+                result = await asyncio.to_thread(pygit2_status, path, untracked != "-uno")
+                if result is not None:
+                    return result
+            # One status call carries both the branch/ahead/behind headers and the changes
+            out, _, rc = await async_run(_git_ro(status_args), cwd=path, text=False)
+            if rc != 0 or not out:
+                return None
+            return parse_branch_header(out), status_rows(out)
+
+        async def status_and_branches():
+            results = await asyncio.gather(read_status(), asyncio.to_thread(refs.branches))
+            self._post(self._apply_refresh, [path, generation, huge, scope, stashes] + results)
+
+        async def log():
+            rows = await asyncio.to_thread(self._cached_log_rows, refs, session, n, path)
+            self._post(self._apply_refresh_log, (rows,))
+
+        # Each part is shown as soon as it lands; the Changes list doesn't wait for the log
+        reads = [status_and_branches()]
+        if session is not None:
+            reads.append(log())
+        try:
+            await asyncio.gather(*reads)
+        finally:
+            self._post(self._finish_refresh, ())
+
+    def _cached_log_rows(self, refs, session, n, path):
+        """
+        log_rows, reused while HEAD and the local refs are untouched: the log can
+        only change when one of their mtimes does. Runs on a worker thread.
+        """
+        key = refs.key()
+        cached = self._refresh_cache.get(path)
+        if key is not None and cached and cached[0] == key and cached[1] == n:
+            return cached[2]
+        log = log_rows(session, n, path)
+        if key is not None and log[2] == 0:
+            self._refresh_cache[path] = (key, n, log)
+        return log
+
+    def _finish_refresh(self):
+        self._inflight -= 1
+        self._refreshing = False
+        if self._refresh_again:
+            self._refresh_again = False
+            self._schedule_refresh()
+
+    def _apply_refresh(self, path, generation, huge, scope, stashes, status, refs):
+        # `status` is ((branch, ahead, behind) or None, rows), or None if it failed
+        ok = status is not None
+        state, rows = status if ok else (None, [])
 
         # Current branch & ahead/behind
-        out, err, rc = safe_run(["git", "status", "-sb"], cwd=path)
-        if rc == 0 and out:
-            first = out.splitlines()[0].strip()
-            self.current_branch.set(first.replace("## ", "").split("...")[0])
-            ahead, behind = parse_ahead_behind(first)
-            self.status_right.configure(text=f"Branch: {self.current_branch.get()} | ↑ {ahead} ↓ {behind}")
+        if state:
+            branch, ahead, behind = state
+            banner = " | Huge repo — untracked hidden" if huge else ""
+            if scope:
+                banner += f" | Changes limited to {scope}"
+            text = f"Branch: {branch} | ↑ {ahead} ↓ {behind}{banner}"
         else:
-            self.current_branch.set("")
-            self.status_right.configure(text="")
+            branch = text = ""
+        # Unchanged values are not sent across the Tcl bridge again
+        if text != self._shown_status_text:
+            self._shown_status_text = text
+            self.status_right.configure(text=text)
+        self.current_branch.set(branch)
+
+        # Stash badge; the entries also back "List in Console"
+        self._stashes = stashes
+        self.stash_count.set(f"Stashes: {len(stashes)}" if stashes is not None else "Stashes: –")
+
+        # None when the scan skipped untracked files, so commit can't rely on it
+        scanned = ok and not huge and not scope and self.show_untracked.get()
+        untracked = any(s == "Untracked" for s, _ in rows) if scanned else None
 
         # Branch list
-        out, _, rc = safe_run(["git", "branch", "--list"], cwd=path)
-        branches = []
-        if rc == 0 and out:
-            for line in out.splitlines():
-                name = line.replace("*", "").strip()
-                if name:
-                    branches.append(name)
-        self.branch_combo["values"] = branches
-        # Keep selection coherent
-        if self.current_branch.get() and self.current_branch.get() in branches:
-            self.branch_combo.set(self.current_branch.get())
-            self.selected_branch.set(self.current_branch.get())
-        elif branches:
-            self.branch_combo.set(branches[0])
-            self.selected_branch.set(branches[0])
+        branches = [name for name, _ in refs]
+        # Branch/commit actions validate against this instead of asking git again
+        self._repo_state = {"branch": branch, "branches": frozenset(branches), "untracked": untracked,
+                            "path": path, "generation": generation}
+        if branches != self._shown_branches:
+            self._shown_branches = branches
+            self.branch_combo["values"] = branches
+        # Keep the user's pick while it exists: watcher refreshes run unprompted,
+        # and Checkout/Delete/Reset act on whatever is selected
+        known = self._repo_state["branches"]
+        if self.selected_branch.get() not in known:
+            pick = branch if branch in known else (branches[0] if branches else None)
+            if pick:
+                self.branch_combo.set(pick)
+                self.selected_branch.set(pick)
 
         # Changes list
-        out, _, rc = safe_run(["git", "status", "--porcelain"], cwd=path)
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        if rc == 0 and out:
-            for item in parse_status_porcelain(out):
-                self.tree.insert("", tk.END, values=(item["status"], item["path"]))
+        self.populate_tree(rows)
+
+    def _apply_refresh_log(self, log):
+        # Unchanged cache hits leave the list as it is
+        if log is not self._shown_log:
+            self._shown_log = log
+            self._show_log(*log)
 
-        # Log
-        self.load_log()
+    def _git_session(self):
+        """Return the GitSession for the current repo, restarting it if the repo changed."""
+        path = self.repo_path.get().strip()
+        if self._session is None or self._session.repo != path:
+            if self._session:
+                self._session.close()
+            self._session = GitSession(path)
+        return self._session
+
+    def populate_tree(self, rows):
+        """
+        Show `rows` ((status, path) tuples) in the Changes list; row iids are
+        the paths. A path status lists twice (e.g. "Deleted" and "Untracked"
+        after `git rm --cached`) gets one row with both statuses. A refresh
+        usually changes only a few rows, so when the surviving rows keep their
+        order only the difference is sent to Tk, which also keeps the
+        selection and scroll position.
+        """
+        old = self._tree_rows
+        new = {}
+        for status, path in rows:
+            shown = new.get(path)
+            new[path] = status if shown is None else f"{shown}, {status}"
+        if len(new) != len(rows):
+            rows = [(status, path) for path, status in new.items()]
+        self._tree_rows = new
+        removed = [path for path in old if path not in new]
+        kept_old = [path for path in old if path in new]
+        kept_new = [path for path in new if path in old]
+        if not old or kept_old != kept_new or len(new) - len(kept_new) + len(removed) > len(new) // 2:
+            self._bulk_update(self.tree, rows, iid_col=1)
+            return
+        tree = self.tree
+        if removed:
+            tree.delete(*removed)
+        for index, (status, path) in enumerate(rows):
+            before = old.get(path)
+            if before is None:
+                tree.insert("", index, iid=path, values=(status, path))
+            elif before != status:
+                tree.set(path, "status", status)
+
+    def _bulk_update(self, tree, rows, iid_col=None):
+        """
+        Replace every row of `tree` in one pass: a single delete for all old rows,
+        headings and columns hidden while inserting so Tk doesn't relayout per
+        row, and rows inserted at index 0 in reverse (Tk walks the sibling list
+        for "end").
+        With `iid_col`, that column's value becomes the row's iid, so callers can
+        read it straight from selection().
+        """
+        children = tree.get_children()
+        if children:
+            tree.delete(*children)
+        if not rows:
+            return
+        displaycolumns = tree["displaycolumns"]
+        tree.configure(show="", displaycolumns=())
+        try:
+            insert = tree.insert
+            if iid_col is None:
+                for values in reversed(rows):
+                    insert("", 0, values=values)
+            else:
+                for values in reversed(rows):
+                    insert("", 0, iid=values[iid_col], values=values)
+        finally:
+            tree.configure(show="headings", displaycolumns=displaycolumns)
+
+    def _refs(self):
+        """Return the RefCache for the current repo."""
+        path = self.repo_path.get().strip()
+        if self._ref_cache is None or self._ref_cache.repo != path:
+            self._ref_cache = RefCache(path)
+        return self._ref_cache
 
     def _repo_selected(self):
         path = self.repo_path.get().strip()
         if not path:
             messagebox.showinfo("Repository", "Select or initialize a repository first.")
             return False
-        if not os.path.isdir(path):
+        now = time.monotonic()
+        if path == self._validated_git_repo and now - self._validated_git_at < VALIDATED_REPO_TTL:
+            return True
+        path_is_dir, git_is_dir = _stat_git(path)
+        if git_is_dir:
+            self._validated_git_repo, self._validated_git_at = path, now
+            return True
+        self._validated_git_repo = None
+        if not path_is_dir:
             messagebox.showerror("Repository", "Selected path is not a directory.")
             return False
-        git_dir = os.path.join(path, ".git")
-        if not os.path.isdir(git_dir):
-            messagebox.showwarning("Repository", "This folder does not look like a Git repository (missing .git).")
-            return False
-        return True
+        messagebox.showwarning("Repository", "This folder does not look like a Git repository (missing .git).")
+        return False
 
 # ---------------------------
 # Entry Point
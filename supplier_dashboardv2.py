@@ -36,7 +36,10 @@ import threading
 import traceback
 import urllib.request
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
+from itertools import islice
+from types import MappingProxyType
 from tkinter import (
     Tk, StringVar, IntVar, BooleanVar, Toplevel, N, S, E, W, BOTH, LEFT, RIGHT, X, Y, END
 )
@@ -128,16 +131,63 @@ ALL_COLUMNS = [
 
 DEFAULT_VISIBLE_COLUMNS = [c[0] for c in ALL_COLUMNS if c[3]]
 
+# Columns written by a sync (everything except id and the timestamps)
+SYNC_FIELDS = [
+    "name", "sap_id", "status", "vendor_category", "contact", "address", "website",
+    "vendor_manager", "platform", "api_integration", "payment_terms", "freight_matrix",
+    "abn", "account_id", "external_id", "country", "postcode",
+]
+
+# (field, label) rows of the edit dialog, and the ones saved as integers
+EDIT_FORM_FIELDS = (
+    ("name", "Vendor"), ("sap_id", "Supplier SAP ID"), ("status", "Status"),
+    ("vendor_category", "Vendor Category"), ("contact", "Contact"),
+    ("address", "Address"), ("website", "Website"), ("vendor_manager", "Vendor Manager"),
+    ("platform", "Platform"), ("api_integration", "API Integration (0/1)"),
+    ("payment_terms", "Payment Terms"), ("freight_matrix", "Freight Matrix"),
+    ("abn", "ABN"), ("account_id", "Account ID"), ("external_id", "External ID"),
+    ("country", "Country"), ("postcode", "Postcode"),
+)
+EDIT_INT_FIELDS = frozenset(("external_id", "api_integration"))
+
 # # ------------------------ DATA ACCESS ------------------------
 
 
 
+# WAL lets the UI read while a sync writes; NORMAL sync is safe under WAL
+DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
+def connect_db(db_path, **kwargs):
+    """sqlite3.connect with the app's PRAGMAs applied (UI and sync connections alike)."""
+    # Room for every sort/filter variant of the table queries (default is 128)
+    kwargs.setdefault("cached_statements", 256)
+    conn = sqlite3.connect(db_path, **kwargs)
+    for pragma in DB_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
 class DataAccess:
     def __init__(self, db_path=DB_FILE):
         self.db_path = db_path
         # Connection for UI thread
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = connect_db(self.db_path)
+        # The UI connection mostly reads: map up to 1 GB so pages come straight from the OS cache
+        self.conn.execute("PRAGMA mmap_size=1073741824")
         self.conn.row_factory = sqlite3.Row
+        # (sort_col, sort_dir, columns) -> (select, order by) for the table page queries
+        self._sql = {}
+        # Per-instance caches keyed by data_version(): they die with this DataAccess
+        # and its connection, and never serve rows read through another one
+        self._count_for_filter = lru_cache(maxsize=32)(self._read_count)
+        self._page_rows = lru_cache(maxsize=64)(self._read_page_rows)
+        self._stats = lru_cache(maxsize=1)(self._read_stats)
         self._create_tables()
 
     def _create_tables(self):
@@ -168,9 +218,70 @@ class DataAccess:
         """)
         cur.execute("CREATE INDEX IF NOT EXISTS idx_suppliers_name ON suppliers(name)")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_suppliers_account ON suppliers(account_id)")
+        # Matches the default ORDER BY, so seeking to a page is an index range scan
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_suppliers_name_id ON suppliers(name COLLATE NOCASE, id)")
+        # Other sortable columns; rowid (id) is implied as the last index column
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_suppliers_updated_at ON suppliers(updated_at)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_suppliers_external_id ON suppliers(external_id)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_suppliers_status_name ON suppliers(status, name COLLATE NOCASE)")
+        # Columns declared INTEGER sort natively (and by index) without a CAST
+        self.integer_cols = {r["name"] for r in self.conn.execute("PRAGMA table_info(suppliers)")
+                             if r["type"].upper() == "INTEGER"}
+        # Every other sortable column, indexed on exactly its ORDER BY expression
+        for field, *_ in ALL_COLUMNS:
+            if field in ("id", "name", "updated_at", "external_id"):
+                continue  # rowid, or indexed above
+            cur.execute(f"CREATE INDEX IF NOT EXISTS idx_suppliers_sort_{field} "
+                        f"ON suppliers({self._sort_expr(field)})")
+        self.has_fts = self._create_fts(cur)
         self.conn.commit()
 
+    def _create_fts(self, cur):
+        """
+        Trigram FTS5 index over the quick filter columns, kept in step with
+        suppliers by triggers. Returns False when this SQLite build lacks
+        FTS5 or the trigram tokenizer (3.34+); the filter then stays on LIKE.
+        """
+        cur.execute("SELECT 1 FROM sqlite_master WHERE name = 'suppliers_fts'")
+        existed = cur.fetchone() is not None
+        try:
+            cur.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS suppliers_fts USING fts5(
+                    name, sap_id, account_id,
+                    content='suppliers', content_rowid='id', tokenize='trigram'
+                )
+            """)
+        except sqlite3.OperationalError:
+            return False
+        cur.execute("""
+            CREATE TRIGGER IF NOT EXISTS suppliers_fts_ai AFTER INSERT ON suppliers BEGIN
+                INSERT INTO suppliers_fts(rowid, name, sap_id, account_id)
+                VALUES (new.id, new.name, new.sap_id, new.account_id);
+            END
+        """)
+        cur.execute("""
+            CREATE TRIGGER IF NOT EXISTS suppliers_fts_ad AFTER DELETE ON suppliers BEGIN
+                INSERT INTO suppliers_fts(suppliers_fts, rowid, name, sap_id, account_id)
+                VALUES ('delete', old.id, old.name, old.sap_id, old.account_id);
+            END
+        """)
+        cur.execute("""
+            CREATE TRIGGER IF NOT EXISTS suppliers_fts_au AFTER UPDATE OF name, sap_id, account_id ON suppliers BEGIN
+                INSERT INTO suppliers_fts(suppliers_fts, rowid, name, sap_id, account_id)
+                VALUES ('delete', old.id, old.name, old.sap_id, old.account_id);
+                INSERT INTO suppliers_fts(rowid, name, sap_id, account_id)
+                VALUES (new.id, new.name, new.sap_id, new.account_id);
+            END
+        """)
+        if not existed:
+            # Index the rows that were there before the FTS table
+            cur.execute("INSERT INTO suppliers_fts(suppliers_fts) VALUES ('rebuild')")
+        return True
+
     def close(self):
+        self._count_for_filter.cache_clear()
+        self._page_rows.cache_clear()
+        self._stats.cache_clear()
         try:
             self.conn.close()
         except:
@@ -200,106 +311,286 @@ class DataAccess:
         # q: simple quick filter applied to name/vendor/sap/account_id
         where = ""
         params = []
-        if q:
+        if q and self.has_fts and len(q) >= 3:
+            # Trigram phrase match = case-insensitive substring, like the LIKE below,
+            # but answered from the FTS index; trigrams need 3+ characters
+            where = "WHERE id IN (SELECT rowid FROM suppliers_fts WHERE suppliers_fts MATCH ?)"
+            params.append('"%s"' % q.replace('"', '""'))
+        elif q:
             where = "WHERE (name LIKE ? OR IFNULL(sap_id,'') LIKE ? OR IFNULL(account_id,'') LIKE ?)"
             like = f"%{q}%"
             params.extend([like, like, like])
         return where, params
 
-    def _order_by_clause(self, sort_col, sort_dir):
+    def _sort_expr(self, sort_col):
         if not sort_col:
-            return "ORDER BY name COLLATE NOCASE ASC"
-        # numeric columns
-        numeric_cols = {c[0] for c in ALL_COLUMNS if c[4]}
-        if sort_col in numeric_cols:
-            return f"ORDER BY CAST({sort_col} AS INTEGER) {sort_dir}"
+            return "name COLLATE NOCASE"
+        # numeric columns are stored as INTEGER already; a CAST would hide the index
+        if sort_col in self.integer_cols:
+            return sort_col
         # updated_at sort should use datetime (stored ISO)
         if sort_col == "updated_at":
-            return f"ORDER BY {sort_col} {sort_dir}"
+            return sort_col
         # default text sort case-insensitive
-        return f"ORDER BY {sort_col} COLLATE NOCASE {sort_dir}"
+        return f"{sort_col} COLLATE NOCASE"
+
+    def _order_by_clause(self, sort_col, sort_dir):
+        # id breaks ties so every row has a fixed position (needed for seeking)
+        return f"ORDER BY {self._sort_expr(sort_col)} {sort_dir}, id {sort_dir}"
 
-    def query_page(self, q, sort_col, sort_dir, page_size, page_index):
+    def _read_count(self, q, version):
+        """
+        COUNT(*) for a quick filter. A LIKE '%q%' filter can't use an index, so
+        the count is cached, as _count_for_filter, while `version` (data_version()) is unchanged:
+        paging through one filter then counts once instead of per page.
+        """
         where, params = self._build_where_clause(q)
-        order = self._order_by_clause(sort_col, sort_dir)
-        limit = "LIMIT ? OFFSET ?"
-        sql = f"SELECT * FROM suppliers {where} {order} {limit}"
-        total_sql = f"SELECT COUNT(*) FROM suppliers {where}"
         cur = self.conn.cursor()
-        cur.execute(total_sql, params)
-        total = cur.fetchone()[0]
-        offset = page_index * page_size
-        cur.execute(sql, params + [page_size, offset])
-        rows = [dict(r) for r in cur.fetchall()]
-        return rows, total
+        cur.execute(f"SELECT COUNT(*) FROM suppliers {where}", params)
+        return cur.fetchone()[0]
 
-    def get_stats(self):
+    def _seek_segments(self, sort_col, sort_dir, after):
+        """
+        Conditions, in ORDER BY order, for the rows that follow `after`
+        (sort_key, id). SQLite sorts NULLs first ascending and last descending;
+        NULLs get their own segment so each one stays an index range search.
+        """
+        expr = self._sort_expr(sort_col)
+        key, rec_id = after
+        op = "<" if sort_dir == "DESC" else ">"
+        if key is None:
+            segments = [(f"{expr} IS NULL AND id {op} ?", [rec_id])]
+            if sort_dir != "DESC":
+                segments.append((f"{expr} IS NOT NULL", []))
+            return segments
+        segments = [(f"{expr} {op}= ? AND ({expr} {op} ? OR id {op} ?)", [key, key, rec_id])]
+        if sort_dir == "DESC":
+            segments.append((f"{expr} IS NULL", []))
+        return segments
+
+    def query_page(self, q, sort_col, sort_dir, page_size, page_index, after=None, columns=None):
+        """
+        One page of suppliers (sqlite3.Row), the filtered total and the page
+        index actually read: a page_index past the end is clamped to the last
+        page (read by OFFSET, since `after` belonged to the original page). Each row
+        carries a 'sort_key' that, with its id, can be passed back as `after`
+        to seek straight to the next page instead of skipping
+        page_index * page_size rows with OFFSET.
+        With `columns`, rows are laid out for display instead of holding every
+        column: id, then one value per ALL_COLUMNS field ('' when NULL or not
+        in `columns`; id is always filled), then sort_key.
+        """
+        version = self.data_version()
+        total = self._count_for_filter(q, version)
+        max_page_idx = max((total - 1) // page_size, 0)
+        if page_index > max_page_idx:
+            page_index, after = max_page_idx, None
+        columns = tuple(c for c in columns if c != "id") if columns is not None else None
+        rows = self._page_rows(q, sort_col, sort_dir, page_size, page_index, after, columns, version)
+        return list(rows), total, page_index
+
+    def _read_page_rows(self, q, sort_col, sort_dir, page_size, page_index, after, columns, version):
+        """
+        Rows for query_page as a tuple, cached as _page_rows per data_version()
+        like the count, so flipping back to a recent page or filter doesn't hit
+        SQLite again.
+        """
+        where, params = self._build_where_clause(q)
+        select, order = self._page_sql(sort_col, sort_dir, columns)
         cur = self.conn.cursor()
-        stats = {}
-        cur.execute("SELECT COUNT(*) FROM suppliers")
-        stats["total"] = cur.fetchone()[0]
+        if after is None:
+            offset = page_index * page_size
+            cur.execute(f"{select} {where} {order} LIMIT ? OFFSET ?", params + [page_size, offset])
+            return tuple(cur.fetchall())
+        rows = []
+        for seek, seek_params in self._seek_segments(sort_col, sort_dir, after):
+            seek_where = f"{where} AND ({seek})" if where else f"WHERE {seek}"
+            cur.execute(f"{select} {seek_where} {order} LIMIT ?", params + seek_params + [page_size - len(rows)])
+            rows.extend(cur.fetchall())
+            if len(rows) == page_size:
+                break
+        return tuple(rows)
+
+    def iter_rows(self, q, sort_col, sort_dir, columns, conn=None, chunk=2000):
+        """
+        Every supplier matching the quick filter, in table order, as rows of
+        `columns`, read `chunk` rows at a time so memory stays flat however
+        many rows there are. Pass `conn` to read from another thread.
+        """
+        where, params = self._build_where_clause(q)
+        cur = (conn or self.conn).cursor()
+        cur.execute(f"SELECT {', '.join(columns)} FROM suppliers {where} "
+                    f"{self._order_by_clause(sort_col, sort_dir)}", params)
+        while True:
+            rows = cur.fetchmany(chunk)
+            if not rows:
+                break
+            yield from rows
+
+    def _page_sql(self, sort_col, sort_dir, columns):
+        sql = self._sql.get((sort_col, sort_dir, columns))
+        if sql is None:
+            if columns is None:
+                cols = "*"
+            else:
+                # Aliased so ORDER BY/WHERE still see the raw (indexed) columns
+                shown = set(columns) | {"id"}
+                cols = "id, " + ", ".join(
+                    f"IFNULL({c[0]}, '') AS shown_{c[0]}" if c[0] in shown else f"'' AS shown_{c[0]}"
+                    for c in ALL_COLUMNS
+                )
+            sql = (f"SELECT {cols}, {self._sort_expr(sort_col)} AS sort_key FROM suppliers",
+                   self._order_by_clause(sort_col, sort_dir))
+            self._sql[(sort_col, sort_dir, columns)] = sql
+        return sql
+
+    def dashboard_snapshot(self, q, sort_col, sort_dir, page_size, page_index, after=None, columns=None):
+        """
+        Stats plus one table page, (stats, rows, total, page_index), read in a single
+        transaction so both come from the same snapshot of the data.
+        """
+        self.conn.execute("BEGIN")
+        try:
+            stats = self.get_stats()
+            rows, total, page_index = self.query_page(q, sort_col, sort_dir, page_size, page_index,
+                                                      after, columns)
+        finally:
+            self.conn.execute("COMMIT")
+        return stats, rows, total, page_index
+
+    def data_version(self):
+        """Changes whenever suppliers may have changed: a commit by another connection or our own."""
+        return self.conn.execute("PRAGMA data_version").fetchone()[0], self.conn.total_changes
 
-        cur.execute("SELECT status, COUNT(*) c FROM suppliers GROUP BY status ORDER BY c DESC")
-        stats["by_status"] = [(r[0] or "Unknown", r[1]) for r in cur.fetchall()]
+    def get_stats(self):
+        """Read-only stats, shared by every caller until data_version() changes."""
+        return self._stats(self.data_version())
 
-        cur.execute("SELECT country, COUNT(*) c FROM suppliers GROUP BY country ORDER BY c DESC LIMIT 5")
-        stats["top_countries"] = [(r[0] or "Unknown", r[1]) for r in cur.fetchall()]
-        return stats
+    def _read_stats(self, version):
+        # Total, per-status and per-country counts in one statement, tagged by kind
+        cur = self.conn.cursor()
+        cur.execute("""
+            SELECT 'total', NULL, COUNT(*) FROM suppliers
+            UNION ALL
+            SELECT 'status', status, COUNT(*) FROM suppliers GROUP BY status
+            UNION ALL
+            SELECT 'country', country, COUNT(*) FROM suppliers GROUP BY country
+        """)
+        stats = {"total": 0}
+        by_status, by_country = [], []
+        for kind, value, count in cur:
+            if kind == "total":
+                stats["total"] = count
+            elif kind == "status":
+                by_status.append((value or "Unknown", count))
+            else:
+                by_country.append((value or "Unknown", count))
+        by_key = lambda r: r[1]
+        stats["by_status"] = tuple(sorted(by_status, key=by_key, reverse=True))
+        stats["top_countries"] = tuple(sorted(by_country, key=by_key, reverse=True)[:5])
+        return MappingProxyType(stats)
 
-    def upsert_supplier(self, conn, s):
+    def merge_suppliers(self, conn, records):
         """
-        Upsert by account_id if present else by (name, external_id).
-        'conn' is a separate sqlite3 connection passed by background thread.
+        Upsert a whole sync batch with the same outcome as upserting the
+        records one by one: each record updates the supplier with its
+        account_id if it has one, else the one with its (name, external_id),
+        taking the lowest id when several match, and is inserted when none
+        does. A record may match a row an earlier record in the batch created
+        or re-keyed.
+        Keys are resolved in batch order against just the rows the batch can
+        touch; the rows are then written from a TEMP table with one UPDATE
+        and one INSERT.
+        Runs in the caller's transaction on 'conn' (the sync thread's connection).
         """
-        # Ensure fields exist
-        fields = {
-            "name": s.get("name"),
-            "sap_id": s.get("sap_id"),
-            "status": s.get("status"),
-            "vendor_category": s.get("vendor_category"),
-            "contact": s.get("contact"),
-            "address": s.get("address"),
-            "website": s.get("website"),
-            "vendor_manager": s.get("vendor_manager"),
-            "platform": s.get("platform"),
-            "api_integration": int(bool(s.get("api_integration"))),
-            "payment_terms": s.get("payment_terms"),
-            "freight_matrix": s.get("freight_matrix"),
-            "abn": s.get("abn"),
-            "account_id": s.get("account_id"),
-            "external_id": s.get("external_id"),
-            "country": s.get("country"),
-            "postcode": s.get("postcode"),
-            "updated_at": dt.datetime.utcnow().isoformat(timespec='seconds'),
-        }
+        now = dt.datetime.utcnow().isoformat(timespec='seconds')
+        api_idx = SYNC_FIELDS.index("api_integration")
+        rows = []
+        for seq, s in enumerate(records):
+            row = [seq] + [s.get(f) for f in SYNC_FIELDS]
+            row[api_idx + 1] = int(bool(row[api_idx + 1]))
+            rows.append(row)
+        # A blank account_id is stored as given but matches by name
+        by_account_id = [bool(s.get("account_id")) for s in records]
+
+        cols = ", ".join(SYNC_FIELDS)
+        t_cols = ", ".join(f"t.{f}" for f in SYNC_FIELDS)
+        qmarks = ", ".join(["?"] * len(SYNC_FIELDS))
+        # Typed like suppliers, so keys read back compare as they will once stored
+        col_defs = ", ".join(f"{f} {'INTEGER' if f in self.integer_cols else 'TEXT'}" for f in SYNC_FIELDS)
+
         cur = conn.cursor()
-        # Strategy: try match by account_id first
-        if fields["account_id"]:
-            cur.execute("SELECT id FROM suppliers WHERE account_id = ?", (fields["account_id"],))
-            existing = cur.fetchone()
-            if existing:
-                set_clause = ", ".join([f"{k} = ?" for k in fields.keys()])
-                cur.execute(f"UPDATE suppliers SET {set_clause} WHERE id = ?", list(fields.values()) + [existing[0]])
+        cur.execute(f"CREATE TEMP TABLE IF NOT EXISTS tmp_sync "
+                    f"(seq INTEGER PRIMARY KEY, target INTEGER, new_row INTEGER, {col_defs})")
+        cur.execute("CREATE INDEX IF NOT EXISTS temp.idx_tmp_sync_target ON tmp_sync(target)")
+        cur.execute("DELETE FROM tmp_sync")
+        cur.executemany(f"INSERT INTO tmp_sync (seq, {cols}) VALUES (?, {qmarks})", rows)
+
+        # Rows that can match a record now (a superset is harmless); ones re-keyed
+        # below only take keys from the batch, so no other row ever becomes a match
+        by_account, by_name, row_keys = {}, {}, {}
+
+        def name_key(name, external_id):
+            return None if name is None else (name, -1 if external_id is None else external_id)
+
+        def index(rec_id, account_id, name, external_id):
+            keys = row_keys[rec_id] = (account_id or None, name_key(name, external_id))
+            if keys[0] is not None:
+                by_account.setdefault(keys[0], set()).add(rec_id)
+            if keys[1] is not None:
+                by_name.setdefault(keys[1], set()).add(rec_id)
+
+        def unindex(rec_id):
+            account, name = row_keys.pop(rec_id)
+            if account is not None:
+                by_account[account].discard(rec_id)
+            if name is not None:
+                by_name[name].discard(rec_id)
+
+        cur.execute("""
+            SELECT id, account_id, name, external_id FROM suppliers
+            WHERE account_id IN (SELECT account_id FROM tmp_sync)
+               OR id IN (SELECT s.id FROM tmp_sync t JOIN suppliers s
+                         ON s.name = t.name AND IFNULL(s.external_id, -1) = IFNULL(t.external_id, -1))
+        """)
+        for candidate in cur.fetchall():
+            index(*candidate)
+
+        # Rows created by the batch get ids past every candidate, in creation order
+        first_new = next_new = max(row_keys, default=0) + 1
+        targets = []
+        cur.execute("SELECT seq, account_id, name, external_id FROM tmp_sync ORDER BY seq")
+        for seq, account_id, name, external_id in cur.fetchall():
+            if by_account_id[seq]:
+                ids = by_account.get(account_id)
             else:
-                fields["created_at"] = dt.datetime.utcnow().isoformat(timespec='seconds')
-                cols = ", ".join(fields.keys() | {"created_at"})
-                qmarks = ", ".join(["?"] * (len(fields) + 1))
-                cur.execute(f"INSERT INTO suppliers ({cols}) VALUES ({qmarks})",
-                            list(fields.values()) + [fields["created_at"]])
-        else:
-            # Fallback match by (name, external_id)
-            cur.execute("SELECT id FROM suppliers WHERE name = ? AND IFNULL(external_id, -1) = IFNULL(?, -1)",
-                        (fields["name"], fields["external_id"]))
-            existing = cur.fetchone()
-            if existing:
-                set_clause = ", ".join([f"{k} = ?" for k in fields.keys()])
-                cur.execute(f"UPDATE suppliers SET {set_clause} WHERE id = ?", list(fields.values()) + [existing[0]])
+                ids = by_name.get(name_key(name, external_id))
+            if ids:
+                rec_id = min(ids)
+                unindex(rec_id)
+            else:
+                rec_id, next_new = next_new, next_new + 1
+            index(rec_id, account_id, name, external_id)
+            if rec_id < first_new:
+                targets.append((rec_id, None, seq))
             else:
-                fields["created_at"] = dt.datetime.utcnow().isoformat(timespec='seconds')
-                cols = ", ".join(fields.keys() | {"created_at"})
-                qmarks = ", ".join(["?"] * (len(fields) + 1))
-                cur.execute(f"INSERT INTO suppliers ({cols}) VALUES ({qmarks})",
-                            list(fields.values()) + [fields["created_at"]])
+                targets.append((None, rec_id - first_new, seq))
+
+        cur.executemany("UPDATE tmp_sync SET target = ?, new_row = ? WHERE seq = ?", targets)
+        # Each row ends up with the last record written to it
+        cur.execute("DELETE FROM tmp_sync WHERE seq NOT IN (SELECT MAX(seq) FROM tmp_sync GROUP BY target, new_row)")
+        cur.execute(f"""
+            UPDATE suppliers SET ({cols}, updated_at) = (
+                SELECT {t_cols}, ? FROM tmp_sync t WHERE t.target = suppliers.id
+            )
+            WHERE id IN (SELECT target FROM tmp_sync)
+        """, (now,))
+        cur.execute(f"""
+            INSERT INTO suppliers ({cols}, created_at, updated_at)
+            SELECT {t_cols}, ?, ? FROM tmp_sync t
+            WHERE t.target IS NULL
+            ORDER BY t.new_row
+        """, (now, now))
 
     def get_supplier_by_id(self, rec_id):
         cur = self.conn.cursor()
@@ -482,6 +773,24 @@ class DataAccess:
 
 #         return merged
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Fields the API doesn't provide; every merged record starts from these
+API_RECORD_DEFAULTS = {
+    "sap_id": None,
+    "status": "Active",
+    "vendor_category": None,
+    "contact": None,
+    "address": None,
+    "website": None,
+    "vendor_manager": None,
+    "platform": "VS",
+    "api_integration": True,
+    "payment_terms": None,
+    "freight_matrix": None,
+    "abn": None,
+}
 
 class ApiClient:
     def __init__(self, api_auth):
@@ -491,10 +800,18 @@ class ApiClient:
         }
         if self.api_auth:
             self.headers["Authorization"] = self.api_auth
+        # One pooled session per client: pagination hops reuse the keep-alive
+        # connection instead of a new TCP+TLS handshake per page
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def _http_get_json(self, url):
         try:
-            resp = requests.get(url, headers=self.headers, timeout=30)
+            resp = self.session.get(url, timeout=30)
             resp.raise_for_status()
             return resp.json()
         except requests.RequestException as e:
@@ -511,8 +828,13 @@ class ApiClient:
         return results
 
     def fetch_suppliers_merged(self):
-        products = self._fetch_all_paginated(API_URL_PRODUCTS)
-        orders = self._fetch_all_paginated(API_URL_ORDERS)
+        # The two endpoints are independent, so walk their pages concurrently;
+        # the session's pool gives each walk its own keep-alive connection
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            products_future = pool.submit(self._fetch_all_paginated, API_URL_PRODUCTS)
+            orders_future = pool.submit(self._fetch_all_paginated, API_URL_ORDERS)
+            products = products_future.result()
+            orders = orders_future.result()
 
         ord_by_acc = {}
         ord_by_name = {}
@@ -521,52 +843,35 @@ class ApiClient:
             nm = o.get("name")
             ord_by_acc[acc] = o
             if nm:
-                ord_by_name[nm.lower()] = o
-
-        merged = []
-        for p in products:
-            acc = p.get("account_id")
-            nm = p.get("name")
-            o = ord_by_acc.get(acc) or (ord_by_name.get(nm.lower()) if nm else None)
-            merged.append({
-                "name": p.get("name") or (o.get("name") if o else None),
-                "sap_id": None,
-                "status": "Active",
-                "vendor_category": None,
-                "contact": None,
-                "address": None,
-                "website": None,
-                "vendor_manager": None,
-                "platform": "VS",
-                "api_integration": True,
-                "payment_terms": None,
-                "freight_matrix": None,
-                "abn": None,
-                "account_id": p.get("account_id") or (o.get("account_id") if o else None),
+                ord_by_name[nm.casefold()] = o
+
+        merged = [None] * len(products)
+        seen_acc = set()  # account_ids already merged, filled as we go
+        by_acc_get = ord_by_acc.get
+        by_name_get = ord_by_name.get
+        for i, p in enumerate(products):
+            p_get = p.get
+            nm = p_get("name")
+            o = by_acc_get(p_get("account_id")) or (by_name_get(nm.casefold()) if nm else None)
+            merged_acc = p_get("account_id") or (o.get("account_id") if o else None)
+            if merged_acc:
+                seen_acc.add(merged_acc)
+            merged[i] = {
+                **API_RECORD_DEFAULTS,
+                "name": nm or (o.get("name") if o else None),
+                "account_id": merged_acc,
                 "external_id": (o.get("id") if o else None),
-                "country": p.get("country"),
-                "postcode": p.get("postcode"),
-            })
+                "country": p_get("country"),
+                "postcode": p_get("postcode"),
+            }
 
-        seen_acc = {m["account_id"] for m in merged if m.get("account_id")}
         for o in orders:
             acc = o.get("account_id")
             if acc and acc not in seen_acc:
                 merged.append({
+                    **API_RECORD_DEFAULTS,
                     "name": o.get("name"),
-                    "sap_id": None,
-                    "status": "Active",
-                    "vendor_category": None,
-                    "contact": None,
-                    "address": None,
-                    "website": None,
-                    "vendor_manager": None,
-                    "platform": "VS",
-                    "api_integration": True,
-                    "payment_terms": None,
-                    "freight_matrix": None,
-                    "abn": None,
-                    "account_id": o.get("account_id"),
+                    "account_id": acc,
                     "external_id": o.get("id"),
                     "country": None,
                     "postcode": None,
@@ -586,19 +891,27 @@ class SyncWorker(threading.Thread):
         conn = None
         try:
             self._push(("status", "Sync started..."))
-            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            # Autocommit mode: the merge below manages its own transaction
+            conn = connect_db(self.db_path, check_same_thread=False, isolation_level=None)
             api = ApiClient(self.api_auth)
-            merged = api.fetch_suppliers_merged()
+            try:
+                merged = api.fetch_suppliers_merged()
+            finally:
+                api.session.close()
             total = len(merged)
             self._push(("status", f"Fetched {total} records, writing to DB..."))
-            da = DataAccess(self.db_path)  # to reuse upsert logic; but will open another conn; we won’t use its UI conn
-            # Use local conn for upserts to ensure thread isolation:
-            for i, item in enumerate(merged, start=1):
-                da.upsert_supplier(conn, item)
-                if i % 50 == 0 or i == total:
-                    conn.commit()
-                    self._push(("progress", i, total))
-            conn.commit()
+            da = DataAccess(self.db_path)  # to reuse the merge logic; but will open another conn; we won’t use its UI conn
+            da.close()
+            # Use local conn for the merge to ensure thread isolation; one transaction,
+            # taking the write lock up front rather than upgrading mid-merge
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                da.merge_suppliers(conn, merged)
+                conn.execute("COMMIT")
+            except:
+                conn.execute("ROLLBACK")
+                raise
+            self._push(("progress", total, total))
             self._push(("status", "Sync complete."))
             self._push(("done",))
         except Exception as ex:
@@ -611,10 +924,17 @@ class SyncWorker(threading.Thread):
                 pass
 
     def _push(self, msg):
+        # The queue is bounded: status and progress updates may be dropped when
+        # the UI falls behind, but "done"/"error" wait for room so they always arrive
+        kind = msg[0]
+        if kind == "status" and self.progress_queue.full():
+            return
         try:
             self.progress_queue.put_nowait(msg)
-        except:
-            pass
+        except queue.Full:
+            if kind not in ("done", "error"):
+                return
+            self.progress_queue.put(msg)
 
 # ------------------------ EDIT DIALOG ------------------------
 
@@ -634,18 +954,8 @@ class EditDialog(Toplevel):
         container = ttk.Frame(self)
         container.pack(fill=BOTH, expand=True, padx=16, pady=16)
 
-        form_fields = [
-            ("name", "Vendor"), ("sap_id", "Supplier SAP ID"), ("status", "Status"),
-            ("vendor_category", "Vendor Category"), ("contact", "Contact"),
-            ("address", "Address"), ("website", "Website"), ("vendor_manager", "Vendor Manager"),
-            ("platform", "Platform"), ("api_integration", "API Integration (0/1)"),
-            ("payment_terms", "Payment Terms"), ("freight_matrix", "Freight Matrix"),
-            ("abn", "ABN"), ("account_id", "Account ID"), ("external_id", "External ID"),
-            ("country", "Country"), ("postcode", "Postcode"),
-        ]
-
         # Layout grid
-        for i, (key, label) in enumerate(form_fields):
+        for i, (key, label) in enumerate(EDIT_FORM_FIELDS):
             ttk.Label(container, text=label).grid(row=i, column=0, sticky=E, padx=(0,8), pady=4)
             var = StringVar(value=str(self.fields.get(key, "") if self.fields.get(key) is not None else ""))
             self.vars[key] = var
@@ -656,7 +966,7 @@ class EditDialog(Toplevel):
 
         # Buttons
         btns = ttk.Frame(container)
-        btns.grid(row=len(form_fields), column=0, columnspan=2, sticky=E, pady=(12,0))
+        btns.grid(row=len(EDIT_FORM_FIELDS), column=0, columnspan=2, sticky=E, pady=(12,0))
         ttk.Button(btns, text="Cancel", command=self.destroy).pack(side=RIGHT, padx=8)
         ttk.Button(btns, text="Save", command=self._save).pack(side=RIGHT)
 
@@ -673,7 +983,7 @@ class EditDialog(Toplevel):
         fields = {}
         for k, var in self.vars.items():
             v = var.get().strip()
-            if k in ("external_id", "api_integration"):
+            if k in EDIT_INT_FIELDS:
                 try:
                     v = int(v) if v != "" else None
                 except:
@@ -707,18 +1017,34 @@ class EditDialog(Toplevel):
         EditDialog(self, self.da, rec_id, on_saved)
 
 class TableView(ttk.Frame):
-    def __init__(self, master, data_access: DataAccess):
+    _COL_FIELDS = tuple(c[0] for c in ALL_COLUMNS)  # tree column order
+
+    def __init__(self, master, data_access: DataAccess, progress_queue):
         super().__init__(master)
         self.da = data_access
+        # Page queries run on one worker thread with its own DataAccess (self._reader);
+        # results come back through the app's queue as ("rows", req_id, ...)
+        self.progress_queue = progress_queue
+        self._query_pool = ThreadPoolExecutor(max_workers=1, initializer=self._open_reader)
+        self._query_seq = 0
+        self._pending_after = None  # debounced refresh, see _schedule_refresh
+        self._columns_win = None  # Columns dialog, kept hidden between uses
+        self._column_checks = {}
         self.q = StringVar(value="")
         self.page_size = IntVar(value=DEFAULT_PAGE_SIZE)
         self.page_index = IntVar(value=0)
         self.sort_col = StringVar(value="name")
         self.sort_dir = StringVar(value="ASC")
         self.visible_columns = set(DEFAULT_VISIBLE_COLUMNS)
+        # page index -> (sort_key, id) of the last row before it, for query_page(after=...)
+        self._page_cursors = {}
+        self._cursor_query = None  # (q, sort, dir, page size) the cursors belong to
+        # Current page as tree values; only rows _view_start.. (_view_size of them) are in the tree
+        self._row_values = []
+        self._view_start = 0
+        self._view_size = 20
 
         self._build_ui()
-        self.refresh_table()
 
     def _build_ui(self):
         # Top bar: filter + pager + actions
@@ -730,6 +1056,7 @@ class TableView(ttk.Frame):
         entry = ttk.Entry(top, textvariable=self.q, width=30)
         entry.pack(side=LEFT, padx=(0,12))
         entry.bind("<Return>", lambda e: self._apply_filter())
+        entry.bind("<KeyRelease>", lambda e: self._on_filter_key())
 
         ttk.Button(top, text="Apply", command=self._apply_filter).pack(side=LEFT, padx=(0,8))
         ttk.Button(top, text="Clear", command=self._clear_filter).pack(side=LEFT)
@@ -757,15 +1084,21 @@ class TableView(ttk.Frame):
         ttk.Button(right, text="Export CSV", command=self._export_csv).pack(side=LEFT)
 
         # Treeview
-        self.tree = ttk.Treeview(self, columns=[c[0] for c in ALL_COLUMNS], show="headings", height=20)
+        self.tree = ttk.Treeview(self, columns=self._COL_FIELDS, show="headings", height=20)
         self.tree.pack(fill=BOTH, expand=True)
         self.tree.bind("<Double-1>", self._on_double_click)
-
-        # Scrollbars
-        vsb = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.tree.bind("<Configure>", self._on_tree_resize)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_rows(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_rows(3))
+        self.tree.bind("<Up>", lambda e: self._on_arrow(-1))
+        self.tree.bind("<Down>", lambda e: self._on_arrow(1))
+
+        # Scrollbars; the vertical one scrolls the page rows (see _render_window), not the tree
+        self.vsb = ttk.Scrollbar(self, orient="vertical", command=self._on_vscroll)
         hsb = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscroll=vsb.set, xscroll=hsb.set)
-        vsb.place(relx=1.0, rely=0, relheight=1.0, anchor="ne")
+        self.tree.configure(xscroll=hsb.set)
+        self.vsb.place(relx=1.0, rely=0, relheight=1.0, anchor="ne")
         hsb.pack(fill=X)
 
         # Configure headings and columns
@@ -783,9 +1116,24 @@ class TableView(ttk.Frame):
         self.tree.tag_configure("muted", foreground=TOKYO["muted"])
 
     # --- Actions ---
+    def _schedule_refresh(self, delay=250):
+        # Collapse bursts (typing, repeated clicks) into one refresh after `delay` ms of quiet
+        if self._pending_after:
+            self.after_cancel(self._pending_after)
+        self._pending_after = self.after(delay, self._do_refresh)
+
+    def _do_refresh(self):
+        self._pending_after = None
+        self.refresh_table()
+
+    def _on_filter_key(self):
+        # Live filter; keys that don't change the text (arrows, Shift...) keep the page
+        if self._cursor_query is None or self.q.get().strip() != self._cursor_query[0]:
+            self._apply_filter()
+
     def _apply_filter(self):
         self.page_index.set(0)
-        self.refresh_table()
+        self._schedule_refresh()
 
     def _clear_filter(self):
         self.q.set("")
@@ -794,7 +1142,7 @@ class TableView(ttk.Frame):
 
     def _set_page_size(self):
         self.page_index.set(0)
-        self.refresh_table()
+        self._schedule_refresh()
 
     def _prev_page(self):
         if self.page_index.get() > 0:
@@ -815,18 +1163,30 @@ class TableView(ttk.Frame):
         self.page_index.set(0)
         self.refresh_table()
 
+    def _fetch_columns(self):
+        # Columns query_page needs to read: the visible ones, in table order
+        return tuple(c[0] for c in ALL_COLUMNS if c[0] in self.visible_columns)
+
     def _apply_visible_columns(self):
-        all_cols = [c[0] for c in ALL_COLUMNS]
-        display = [c for c in all_cols if c in self.visible_columns]
+        display = [c for c in self._COL_FIELDS if c in self.visible_columns]
         if not display:
             display = ["name"]
             self.visible_columns = {"name"}
         self.tree["displaycolumns"] = display
 
     def _open_columns_dialog(self):
+        # Built once; later opens just re-sync the checkboxes and show it again
+        if self._columns_win is not None:
+            for field, var in self._column_checks.items():
+                var.set(field in self.visible_columns)
+            self._columns_win.deiconify()
+            self._columns_win.lift()
+            return
+
         win = Toplevel(self)
         win.title("Columns")
         win.configure(bg=TOKYO["bg"])
+        win.protocol("WM_DELETE_WINDOW", win.withdraw)
         frm = ttk.Frame(win)
         frm.pack(fill=BOTH, expand=True, padx=12, pady=12)
 
@@ -840,39 +1200,64 @@ class TableView(ttk.Frame):
         def apply_and_close():
             self.visible_columns = {f for f, v in checks.items() if v.get()}
             self._apply_visible_columns()
-            win.destroy()
+            self.refresh_table()  # newly shown columns weren't fetched
+            win.withdraw()
         btns = ttk.Frame(frm)
         btns.grid(row=(len(ALL_COLUMNS)//2)+2, column=0, columnspan=2, sticky=E, pady=(8,0))
-        ttk.Button(btns, text="Close", command=win.destroy).pack(side=RIGHT, padx=8)
+        ttk.Button(btns, text="Close", command=win.withdraw).pack(side=RIGHT, padx=8)
         ttk.Button(btns, text="Apply", command=apply_and_close).pack(side=RIGHT)
+        self._columns_win = win
+        self._column_checks = checks
 
     def _export_csv(self):
-        # Export the same data currently displayed (page, filter, sort)
+        # Export every row of the current filter, in the displayed sort and columns
         filename = filedialog.asksaveasfilename(
             defaultextension=".csv",
             filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
         )
         if not filename:
             return
+        headers = [c[1] for c in ALL_COLUMNS if c[0] in self.visible_columns]
+        query = (self.q.get().strip(), self.sort_col.get(), self.sort_dir.get(), self._fetch_columns())
+        result = queue.Queue()
+        threading.Thread(target=self._write_csv, args=(filename, headers, query, result), daemon=True).start()
+        self._poll_export(filename, result)
+
+    def _write_csv(self, filename, headers, query, result):
+        # Export thread: reads on its own connection, reports ("done", n) or ("error", msg)
+        conn = None
         try:
-            # Re-query page
-            rows, total = self.da.query_page(
-                q=self.q.get().strip(),
-                sort_col=self.sort_col.get(),
-                sort_dir=self.sort_dir.get(),
-                page_size=self.page_size.get(),
-                page_index=self.page_index.get()
-            )
-            with open(filename, "w", newline="", encoding="utf-8") as f:
+            conn = connect_db(self.da.db_path)
+            count = 0
+            rows = self.da.iter_rows(*query, conn=conn)
+            with open(filename, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
                 writer = csv.writer(f)
-                headers = [c[1] for c in ALL_COLUMNS if c[0] in self.visible_columns]
-                fields = [c[0] for c in ALL_COLUMNS if c[0] in self.visible_columns]
                 writer.writerow(headers)
-                for r in rows:
-                    writer.writerow([r.get(k, "") if r.get(k, "") is not None else "" for k in fields])
-            messagebox.showinfo("Export", f"Exported {len(rows)} rows to:\n{filename}")
+                # csv writes None as an empty field, so rows go out as read
+                while True:
+                    chunk = list(islice(rows, 50000))
+                    if not chunk:
+                        break
+                    writer.writerows(chunk)
+                    count += len(chunk)
+                    f.flush()
+            result.put(("done", count))
         except Exception as ex:
-            messagebox.showerror("Export Failed", str(ex))
+            result.put(("error", str(ex)))
+        finally:
+            if conn:
+                conn.close()
+
+    def _poll_export(self, filename, result):
+        try:
+            kind, value = result.get_nowait()
+        except queue.Empty:
+            self.after(100, self._poll_export, filename, result)
+            return
+        if kind == "done":
+            messagebox.showinfo("Export", f"Exported {value} rows to:\n{filename}")
+        else:
+            messagebox.showerror("Export Failed", value)
 
     def _on_double_click(self, event):
         try:
@@ -888,43 +1273,158 @@ class TableView(ttk.Frame):
         except Exception as e:
             print("Double-click error:", e)
 
+    # --- Virtual rows ---
+    def _render_window(self):
+        """
+        Make the tree hold exactly the page rows in view. Rows are keyed
+        "row<index>", so sliding the window only deletes the rows that left
+        and inserts the ones that came in.
+        """
+        n = len(self._row_values)
+        start = max(0, min(self._view_start, n - self._view_size))
+        end = min(start + self._view_size, n)
+        self._view_start = start
+        wanted = {f"row{i}" for i in range(start, end)}
+        stale = [iid for iid in self.tree.get_children() if iid not in wanted]
+        if stale:
+            self.tree.delete(*stale)
+        exists, insert, values = self.tree.exists, self.tree.insert, self._row_values
+        for pos, i in enumerate(range(start, end)):
+            iid = f"row{i}"
+            if not exists(iid):
+                insert("", pos, iid=iid, values=values[i])
+        self.tree.yview_moveto(0)
+        if n:
+            self.vsb.set(start / n, end / n)
+        else:
+            self.vsb.set(0, 1)
+
+    def _scroll_rows(self, delta):
+        self._view_start += delta
+        self._render_window()
+        return "break"
+
+    def _on_vscroll(self, action, amount, unit=None):
+        # Scrollbar protocol: ("moveto", fraction) or ("scroll", n, "units"|"pages")
+        if action == "moveto":
+            self._view_start = int(float(amount) * len(self._row_values))
+            self._render_window()
+        elif unit == "pages":
+            self._scroll_rows(int(amount) * self._view_size)
+        else:
+            self._scroll_rows(int(amount))
+
+    def _on_mousewheel(self, event):
+        # Windows/macOS; X11 sends Button-4/5 instead
+        return self._scroll_rows(-3 if event.delta > 0 else 3)
+
+    def _on_arrow(self, step):
+        # Move the focus ourselves so stepping past the window slides it
+        focus = self.tree.focus()
+        if not focus.startswith("row"):
+            return None
+        i = int(focus[3:]) + step
+        if not 0 <= i < len(self._row_values):
+            return "break"
+        if not self._view_start <= i < self._view_start + self._view_size:
+            self._scroll_rows(step)
+        self.tree.focus(f"row{i}")
+        self.tree.selection_set(f"row{i}")
+        return "break"
+
+    def _on_tree_resize(self, event):
+        children = self.tree.get_children()
+        bbox = self.tree.bbox(children[0]) if children else ""
+        header, row_height = (bbox[1], bbox[3]) if bbox else (25, 20)
+        size = max(1, (event.height - header) // row_height)
+        if size != self._view_size:
+            self._view_size = size
+            self._render_window()
+
     # --- Data refresh ---
-    def refresh_table(self):
-        rows, total = self.da.query_page(
+    def refresh_table(self, with_stats=False):
+        # Cursors are only valid for the filter/sort/page size and data they were taken with
+        query = (self.q.get().strip(), self.sort_col.get(), self.sort_dir.get(), self.page_size.get(),
+                 self.da.data_version())
+        if query != self._cursor_query:
+            self._cursor_query = query
+            self._page_cursors.clear()
+        self._query_seq += 1
+        self._request = dict(
             q=self.q.get().strip(),
             sort_col=self.sort_col.get(),
             sort_dir=self.sort_dir.get(),
             page_size=self.page_size.get(),
-            page_index=self.page_index.get()
+            columns=self._fetch_columns()
         )
-        # If page index too high (e.g. after filter change), reset to last page
-        max_page_idx = max((total - 1) // self.page_size.get(), 0)
-        if self.page_index.get() > max_page_idx:
-            self.page_index.set(max_page_idx)
-            rows, total = self.da.query_page(
-                q=self.q.get().strip(),
-                sort_col=self.sort_col.get(),
-                sort_dir=self.sort_dir.get(),
-                page_size=self.page_size.get(),
-                page_index=self.page_index.get()
-            )
+        self._query_pool.submit(self._query_rows, self._query_seq, page_index=self.page_index.get(),
+                                cursors=dict(self._page_cursors), with_stats=with_stats, **self._request)
+
+    def _prefetch_neighbours(self, req_id, page_index, max_page_idx):
+        # Warm the reader's page cache for Prev/Next while the user looks at this page
+        if req_id != self._query_seq:
+            return
+        for idx in (page_index + 1, page_index - 1):
+            if 0 <= idx <= max_page_idx:
+                self._query_pool.submit(self._reader_page, idx, self._page_cursors.get(idx), self._request)
 
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+    def _reader_page(self, page_index, after, request):
+        try:
+            self._reader.query_page(page_index=page_index, after=after, **request)
+        except Exception:
+            traceback.print_exc()
+
+    def _open_reader(self):
+        # Runs on the query thread, so the connection belongs to that thread
+        self._reader = DataAccess(self.da.db_path)
 
-        # Insert rows
-        for r in rows:
-            values = [r.get(c[0], "") if r.get(c[0]) is not None else "" for c in ALL_COLUMNS]
-            self.tree.insert("", END, values=values)
+    def _query_rows(self, req_id, q, sort_col, sort_dir, page_size, page_index, cursors, columns,
+                    with_stats=False):
+        # Query thread: fetch the page (and the stats, if asked) and post it back to the UI
+        try:
+            stats = None
+            # A page index past the end (e.g. after filter change) comes back as the last page
+            if with_stats:
+                stats, rows, total, page_index = self._reader.dashboard_snapshot(
+                    q, sort_col, sort_dir, page_size, page_index,
+                    after=cursors.get(page_index), columns=columns)
+            else:
+                rows, total, page_index = self._reader.query_page(
+                    q, sort_col, sort_dir, page_size, page_index,
+                    after=cursors.get(page_index), columns=columns)
+            self.progress_queue.put(("rows", req_id, page_index, rows, total, stats))
+        except Exception:
+            traceback.print_exc()
+
+    def render_rows(self, req_id, page_index, rows, total):
+        if req_id != self._query_seq:
+            return  # a newer refresh is already on its way
+        self.page_index.set(page_index)
+        if rows:
+            last = rows[-1]
+            self._page_cursors[page_index + 1] = (last["sort_key"], last["id"])
+
+        # Keep the page as value tuples; only the rows in view go into the tree.
+        # query_page(columns=...) already lays rows out as (id, *tree values, sort_key)
+        n = len(self._COL_FIELDS)
+        self._row_values = [r[1:n + 1] for r in rows]
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        self._view_start = 0
+        self._render_window()
 
         # Update page info
-        start = self.page_index.get() * self.page_size.get()
+        page_size = self.page_size.get()
+        max_page_idx = max((total - 1) // page_size, 0)
+        start = page_index * page_size
         end = start + len(rows)
         if total == 0:
             label = "No results"
         else:
-            label = f"Page {self.page_index.get()+1} / {max_page_idx+1}  —  items {start+1} {end} of {total}"
+            label = f"Page {page_index+1} / {max_page_idx+1}  —  items {start+1} {end} of {total}"
         self.page_info.config(text=label)
+        self.after_idle(self._prefetch_neighbours, req_id, page_index, max_page_idx)
 
 # ------------------------ LEFT PANEL (ACTIONS + STATS) ------------------------
 
@@ -938,7 +1438,7 @@ class LeftPanel(ttk.Frame):
         self._build_ui()
         # self.left_panel.pack(fill=Y, expand=False)
         # self.table.pack(fill=BOTH, expand=True)
-        self.refresh_stats()
+        # Stats are filled in by the app's first dashboard snapshot
 
     def _build_ui(self):
         # Action buttons
@@ -960,28 +1460,43 @@ class LeftPanel(ttk.Frame):
 
         self.stats_status = ttk.Frame(self)
         self.stats_status.pack(fill=X, pady=2)
+        ttk.Label(self.stats_status, text="By status:", foreground=TOKYO["muted"]).pack(anchor="w")
 
         self.stats_countries = ttk.Frame(self)
         self.stats_countries.pack(fill=X, pady=6)
+        ttk.Label(self.stats_countries, text="Top countries:", foreground=TOKYO["muted"]).pack(anchor="w")
 
-    def refresh_stats(self):
-        stats = self.da.get_stats()
+        # Row labels under each heading, reused across refreshes (see _show_stat_rows)
+        self._status_labels = []
+        self._country_labels = []
+
+    def refresh_stats(self, stats=None):
+        if stats is None:
+            stats = self.da.get_stats()
         self.stats_total.config(text=f"Total suppliers: {stats.get('total', 0)}")
 
         # By status
-        for w in self.stats_status.winfo_children():
-            w.destroy()
-        ttk.Label(self.stats_status, text="By status:", foreground=TOKYO["muted"]).pack(anchor="w")
-        for (status, c) in stats.get("by_status", []):
-            color = TOKYO["success"] if (status or "").lower() == "active" else TOKYO["warn"]
-            ttk.Label(self.stats_status, text=f"• {status}: {c}", foreground=color).pack(anchor="w")
+        self._show_stat_rows(self.stats_status, self._status_labels, [
+            (f"• {status}: {c}", TOKYO["success"] if (status or "").lower() == "active" else TOKYO["warn"])
+            for (status, c) in stats.get("by_status", [])
+        ])
 
         # Top countries
-        for w in self.stats_countries.winfo_children():
-            w.destroy()
-        ttk.Label(self.stats_countries, text="Top countries:", foreground=TOKYO["muted"]).pack(anchor="w")
-        for (ctry, c) in stats.get("top_countries", []):
-            ttk.Label(self.stats_countries, text=f"• {ctry}: {c}").pack(anchor="w")
+        self._show_stat_rows(self.stats_countries, self._country_labels, [
+            (f"• {ctry}: {c}", TOKYO["fg"]) for (ctry, c) in stats.get("top_countries", [])
+        ])
+
+    def _show_stat_rows(self, frame, labels, rows):
+        # Update the pooled labels in place; create more only when a list grows
+        while len(labels) < len(rows):
+            labels.append(ttk.Label(frame))
+        for label, (text, color) in zip(labels, rows):
+            if label.cget("text") != text or str(label.cget("foreground")) != color:
+                label.config(text=text, foreground=color)
+            if not label.winfo_manager():
+                label.pack(anchor="w")
+        for label in labels[len(rows):]:
+            label.pack_forget()
 
     # ---- Sync visual states ----
     def show_sync_start(self, msg="Syncing..."):
@@ -996,7 +1511,6 @@ class LeftPanel(ttk.Frame):
         self.progress.stop()
         self.progress.pack_forget()
         self.status_label.config(text=msg, foreground=TOKYO["success"])
-        self.refresh_stats()
 
     def show_sync_error(self, msg):
         self.progress.stop()
@@ -1030,7 +1544,7 @@ class SupplierApp(Tk):
         right = ttk.Frame(root, padding=8)
         right.pack(side=RIGHT, fill=BOTH, expand=True)
 
-        self.progress_queue = queue.Queue()
+        self.progress_queue = queue.Queue(maxsize=64)
         self.sync_worker = None
 
         # Left panel
@@ -1040,7 +1554,9 @@ class SupplierApp(Tk):
         header = ttk.Frame(right)
         header.pack(fill=X, pady=(0,8))
         ttk.Label(header, text="Suppliers", font=("Segoe UI", 13, "bold")).pack(side=LEFT)
-        self.table = TableView(right, self.da)
+        self.table = TableView(right, self.da, self.progress_queue)
+        # First page and stats in one read
+        self.table.refresh_table(with_stats=True)
         self._poll_progress_queue()
 
     def _apply_tokyo_ttk_theme(self):
@@ -1120,12 +1636,18 @@ class SupplierApp(Tk):
         return None
 
     def _poll_progress_queue(self):
+        msgs = []
         try:
             while True:
-                msg = self.progress_queue.get_nowait()
-                self._handle_progress_message(msg)
+                msgs.append(self.progress_queue.get_nowait())
         except queue.Empty:
             pass
+        # Only the newest progress update of a batch is worth drawing
+        last_progress = max((n for n, m in enumerate(msgs) if m and m[0] == "progress"), default=None)
+        for n, msg in enumerate(msgs):
+            if msg and msg[0] == "progress" and n != last_progress:
+                continue
+            self._handle_progress_message(msg)
         self.after(120, self._poll_progress_queue)
 
     def _handle_progress_message(self, msg):
@@ -1137,9 +1659,14 @@ class SupplierApp(Tk):
         elif typ == "progress":
             _, i, total = msg
             self.left_panel.show_sync_progress(i, total)
+        elif typ == "rows":
+            _, req_id, page_index, rows, total, stats = msg
+            if stats is not None:
+                self.left_panel.refresh_stats(stats)
+            self.table.render_rows(req_id, page_index, rows, total)
         elif typ == "done":
             self.left_panel.show_sync_done()
-            self.table.refresh_table()
+            self.table.refresh_table(with_stats=True)
         elif typ == "error":
             self.left_panel.show_sync_error(msg[1])
             messagebox.showerror("Sync Error", msg[1])
@@ -0,0 +1,95 @@
+import datetime as dt
+import os
+import random
+import tempfile
+import unittest
+
+from supplier_dashboardv2 import SYNC_FIELDS, DataAccess, connect_db
+
+COMPARED = "id, " + ", ".join(SYNC_FIELDS)
+
+
+def upsert_one(conn, s):
+    """Reference: one record at a time, by account_id if present else by (name, external_id)."""
+    now = dt.datetime.utcnow().isoformat(timespec='seconds')
+    values = [s.get(k) for k in SYNC_FIELDS]
+    values[SYNC_FIELDS.index("api_integration")] = int(bool(s.get("api_integration")))
+    update = f"UPDATE suppliers SET {', '.join(f'{k} = ?' for k in SYNC_FIELDS)}, updated_at = ? WHERE id = "
+    cur = conn.cursor()
+    if s.get("account_id"):
+        cur.execute(update + "(SELECT id FROM suppliers WHERE account_id = ? LIMIT 1)",
+                    values + [now, s.get("account_id")])
+    else:
+        cur.execute(update + "(SELECT id FROM suppliers WHERE name = ?"
+                             " AND IFNULL(external_id, -1) = IFNULL(?, -1) LIMIT 1)",
+                    values + [now, s.get("name"), s.get("external_id")])
+    if cur.rowcount == 0:
+        cur.execute(f"INSERT INTO suppliers ({', '.join(SYNC_FIELDS)}, created_at, updated_at) "
+                    f"VALUES ({', '.join('?' * len(SYNC_FIELDS))}, ?, ?)", values + [now, now])
+
+
+def random_record(rng):
+    return {
+        "name": rng.choice(["A", "B", "C", None]),
+        "account_id": rng.choice(["5", "7", "9", None, ""]),
+        "external_id": rng.choice([1, 2, None]),
+        "status": rng.choice(["Active", "Inactive"]),
+        "country": rng.choice(["AU", "NZ"]),
+    }
+
+
+class MergeSuppliersTest(unittest.TestCase):
+    """merge_suppliers must leave the table as upserting the records one by one does."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        paths = [os.path.join(tmp.name, name) for name in ("sequential.db", "merged.db")]
+        self.da = DataAccess(paths[0])
+        self.addCleanup(self.da.close)
+        DataAccess(paths[1]).close()
+        self.conns = [connect_db(path, isolation_level=None) for path in paths]
+        for conn in self.conns:
+            self.addCleanup(conn.close)
+
+    def seed(self, existing):
+        for conn in self.conns:
+            conn.execute("DELETE FROM suppliers")
+            conn.executemany("INSERT INTO suppliers (name, account_id, external_id) VALUES (?, ?, ?)", existing)
+
+    def table(self, conn):
+        return conn.execute(f"SELECT {COMPARED} FROM suppliers ORDER BY id").fetchall()
+
+    def check(self, batch):
+        sequential, merged = self.conns
+        for s in batch:
+            upsert_one(sequential, s)
+        self.da.merge_suppliers(merged, batch)
+        self.assertEqual(self.table(merged), self.table(sequential), batch)
+
+    def test_record_matches_row_created_earlier_in_batch(self):
+        self.check([{"name": "A", "external_id": 1, "account_id": "7"},
+                    {"name": "A", "external_id": 1, "account_id": None}])
+        self.assertEqual(len(self.table(self.conns[1])), 1)
+
+    def test_record_matches_row_renamed_earlier_in_batch(self):
+        self.seed([("A", "5", None)])
+        self.check([{"name": "B", "account_id": "5"}, {"name": "B", "account_id": None}])
+        self.assertEqual(len(self.table(self.conns[1])), 1)
+
+    def test_duplicate_matches_update_only_lowest_id(self):
+        self.seed([("A", "5", None), ("A", "5", None), ("B", None, 1), ("B", None, 1)])
+        self.check([{"name": "C", "account_id": "5"}, {"name": "B", "external_id": 1, "status": "Active"}])
+
+    def test_random_mixed_key_batches(self):
+        for seed in range(300):
+            rng = random.Random(seed)
+            with self.subTest(seed=seed):
+                self.seed([(rng.choice(["A", "B", "C"]), rng.choice(["5", "7", None]), rng.choice([1, 2, None]))
+                           for _ in range(rng.randrange(6))])
+                for _ in range(3):
+                    self.check([random_record(rng) for _ in range(rng.randrange(1, 12))])
+
+
+if __name__ == "__main__":
+    unittest.main()